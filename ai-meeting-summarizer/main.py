@@ -10,6 +10,7 @@ import streamlit as st
 import numpy as np
 import time
 import json
+from html import escape
 from pathlib import Path
 from datetime import datetime
 import threading
@@ -147,13 +148,8 @@ stop_button = col2.button("Stop Recording")
 
 recording_indicator = st.empty()
 
-# Transcript Section
-st.subheader("Live Transcript")
-transcript_box = st.empty()
-
-# Speaker Diarization Section
-st.subheader("Speaker Diarization")
-speaker_box = st.empty()
+# Transcript and Speaker Diarization Sections (filled by live_panel below)
+live_area = st.container()
 
 # Summary Section
 st.subheader("Meeting Summary")
@@ -166,19 +162,48 @@ export_txt = export_col1.button("Export Transcript (TXT)")
 export_pdf = export_col2.button("Export Summary (PDF)")
 
 # --- Placeholder / Real-time Logic ---
+# Heavy modules are created once per process and reused across reruns
+@st.cache_resource
+def get_transcriber():
+    return RealTimeTranscriber()
+
+@st.cache_resource
+def get_diarizer():
+    return SpeakerDiarizer()
+
+@st.cache_resource
+def get_summarizer():
+    return MeetingSummarizer()
+
+@st.cache_resource
+def get_email_sender():
+    return EmailSender()
+
+@st.cache_resource
+def get_export_manager():
+    return ExportManager()
+
 # Initialize modules
-audio_recorder = AudioRecorder()
-transcriber = RealTimeTranscriber()
-diarizer = SpeakerDiarizer()
-summarizer = MeetingSummarizer()
-email_sender = EmailSender()
-export_manager = ExportManager()
+# The recorder holds per-session stream state, so it lives in session_state
+if 'audio_recorder' not in st.session_state:
+    st.session_state.audio_recorder = AudioRecorder()
+audio_recorder = st.session_state.audio_recorder
+transcriber = get_transcriber()
+diarizer = get_diarizer()
+summarizer = get_summarizer()
+email_sender = get_email_sender()
+export_manager = get_export_manager()
 
 # State variables
 if 'recording' not in st.session_state:
     st.session_state.recording = False
 if 'transcript' not in st.session_state:
     st.session_state.transcript = []
+# Append-only rendered HTML, so each new segment costs O(segment) not O(transcript)
+if 'transcript_html' not in st.session_state:
+    st.session_state.transcript_html = ""
+if 'speaker_html' not in st.session_state:
+    st.session_state.speaker_html = ""
 if 'summary' not in st.session_state:
     st.session_state.summary = ""
 
@@ -204,15 +229,36 @@ if start_button:
 if stop_button:
     stop_recording_fn()
 
-# Live transcription loop (simplified)
-if st.session_state.recording:
-    new_segment = transcriber.get_segment()  # blocking or non-blocking
-    if new_segment:
-        st.session_state.transcript.append(f"{new_segment.speaker}: {new_segment.text}")
-        # Update transcript box
-        transcript_box.markdown('<div class="transcript-box">' + "<br>".join(st.session_state.transcript) + '</div>', unsafe_allow_html=True)
-        # Update speaker diarization (placeholder)
-        speaker_box.markdown('<br>'.join([f'<span class="speaker-label">{s.speaker}</span>: {s.text}' for s in st.session_state.transcript]), unsafe_allow_html=True)
+# Live transcription panel: a fragment polls the transcriber on its own
+# schedule, so new segments appear without a full script rerun. The
+# decorator is re-evaluated on every run, so it only polls while recording
+@st.fragment(run_every=0.25 if st.session_state.recording else None)
+def live_panel():
+    if st.session_state.recording:
+        # Drain everything queued since the last tick
+        new_segment = transcriber.get_segment()
+        while new_segment is not None:
+            speaker = getattr(new_segment, 'speaker', 'SPEAKER')
+            st.session_state.transcript.append(f"{speaker}: {new_segment.text}")
+            speaker, text = escape(str(speaker)), escape(new_segment.text)
+            # Append only the new segment to the rendered HTML
+            sep = "<br>" if st.session_state.transcript_html else ""
+            st.session_state.transcript_html += f"{sep}{speaker}: {text}"
+            st.session_state.speaker_html += f'{sep}<span class="speaker-label">{speaker}</span>: {text}'
+            new_segment = transcriber.get_segment()
+    
+    # Transcript Section
+    st.subheader("Live Transcript")
+    if st.session_state.transcript_html:
+        st.markdown('<div class="transcript-box">' + st.session_state.transcript_html + '</div>', unsafe_allow_html=True)
+    
+    # Speaker Diarization Section (placeholder)
+    st.subheader("Speaker Diarization")
+    if st.session_state.speaker_html:
+        st.markdown(st.session_state.speaker_html, unsafe_allow_html=True)
+
+with live_area:
+    live_panel()
 
 # Export buttons
 if export_txt:
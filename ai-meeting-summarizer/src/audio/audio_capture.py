@@ -3,17 +3,61 @@ Audio Capture Module for AI Meeting Summarizer
 Handles real-time audio recording with threading
 """
 
+import gc
+import math
 import sounddevice as sd
 import numpy as np
 import queue
 import threading
-import wave
+import struct
 import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Callable
 import sys
 
+# Frames converted per pass when turning float32 audio into int16 PCM
+_CONVERT_BLOCK = 65536
+
+# Max queued chunks the writer thread coalesces into a single write
+_WRITE_BATCH = 8
+
+# Gen-0 GC threshold while recording (default is 700); keeps collector
+# pauses out of the capture path without disabling GC outright
+_RECORDING_GC_THRESHOLD = (100_000, 50, 50)
+
+
+def float_to_int16(audio_data: np.ndarray) -> np.ndarray:
+    """
+    Convert float32 audio in [-1, 1] to int16 PCM with saturation.
+    Works through a small scratch block so the source is left untouched
+    and no full-size float temporary is allocated.
+    """
+    audio_int16 = np.empty(audio_data.shape, dtype=np.int16)
+    scratch = np.empty((min(len(audio_data), _CONVERT_BLOCK),) + audio_data.shape[1:], dtype=np.float32)
+    
+    for start in range(0, len(audio_data), _CONVERT_BLOCK):
+        block = audio_data[start:start + _CONVERT_BLOCK]
+        tmp = scratch[:len(block)]
+        np.clip(block, -1.0, 1.0, out=tmp)
+        np.multiply(tmp, 32767.0, out=tmp)
+        np.rint(tmp, out=tmp)
+        audio_int16[start:start + len(block)] = tmp
+    
+    return audio_int16
+
+
+def wav_header(sample_rate: int, channels: int, data_size: int) -> bytes:
+    """Canonical 44-byte RIFF/WAVE header for 16-bit PCM"""
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate,
+        sample_rate * channels * 2, channels * 2, 16,
+        b'data', data_size
+    )
+
+
 class AudioRecorder:
     """
     Real-time audio recorder with callback support for live transcription
@@ -24,22 +68,30 @@ class AudioRecorder:
         sample_rate: int = 16000,
         channels: int = 1,
         chunk_duration: float = 1.0,  # Process audio in 1-second chunks
-        device: Optional[int] = None
+        device: Optional[int] = None,
+        async_writes: bool = True  # Write WAV data from a background thread
     ):
         self.sample_rate = sample_rate
         self.channels = channels
         self.chunk_duration = chunk_duration
         self.device = device
-        
-        # Audio queue for threading
-        self.audio_queue = queue.Queue()
+        self.async_writes = async_writes
         
         # Control flags
         self.is_recording = False
-        self.recording_thread = None
         
-        # Audio buffer for complete recording
-        self.audio_buffer = []
+        # WAV file for the current session; frames are streamed to disk
+        # as they arrive so memory stays flat regardless of meeting length
+        self._wf = None
+        self._filename = None
+        self._nframes = 0
+        
+        # Background writer so disk stalls never block the audio callback
+        self._write_queue = queue.SimpleQueue()
+        self._writer_thread = None
+        
+        # GC thresholds to restore when recording stops
+        self._gc_threshold = None
         
         # Callbacks for real-time processing
         self.chunk_callback = None
@@ -65,47 +117,92 @@ class AudioRecorder:
         if status:
             print(f"⚠️ Audio callback status: {status}", file=sys.stderr)
         
-        # Copy audio data to queue
-        audio_chunk = indata.copy()
-        self.audio_queue.put(audio_chunk)
-    
-    def process_audio_queue(self):
-        """Process audio from queue in separate thread"""
-        while self.is_recording:
-            try:
-                # Get audio chunk with timeout
-                audio_chunk = self.audio_queue.get(timeout=0.1)
-                
-                # Store in buffer
-                self.audio_buffer.append(audio_chunk)
+        try:
+            # Append this chunk to the WAV file
+            pcm = float_to_int16(indata)
+            if self._writer_thread:
+                self._write_queue.put(pcm)
+            else:
+                pcm.tofile(self._wf)
+            self._nframes += frames
+            
+            # Call chunk callback if provided (for real-time STT).
+            # Must not block: this runs on the real-time audio thread.
+            # indata is reused by PortAudio after we return, so hand over a copy.
+            if self.chunk_callback:
+                self.chunk_callback(indata.copy(), self.sample_rate)
                 
-                # Call chunk callback if provided (for real-time STT)
-                if self.chunk_callback:
-                    self.chunk_callback(audio_chunk, self.sample_rate)
-                    
-            except queue.Empty:
-                continue
-            except Exception as e:
-                print(f"❌ Error processing audio: {e}")
+        except Exception as e:
+            print(f"❌ Error processing audio: {e}")
+    
+    def _write_worker(self):
+        """Drain queued PCM chunks to the WAV file, batching small writes"""
+        while True:
+            batch = [self._write_queue.get()]
+            while len(batch) < _WRITE_BATCH:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # None is the shutdown sentinel (always the last item queued)
+            done = batch[-1] is None
+            if done:
+                batch.pop()
+            if batch:
+                np.concatenate(batch).tofile(self._wf)
+            if done:
+                return
     
-    def start_recording(self, chunk_callback: Optional[Callable] = None):
-        """Start recording audio"""
+    def start_recording(
+        self,
+        chunk_callback: Optional[Callable] = None,
+        blocksize: Optional[int] = None
+    ):
+        """
+        Start recording audio
+        
+        Args:
+            chunk_callback: Optional callable(chunk, sample_rate) for real-time processing
+            blocksize: Frames per stream callback. Larger blocks mean fewer callbacks
+                (less overhead) but higher latency; align with the STT batch length.
+                Defaults to chunk_duration, or 2-second blocks when no chunk_callback
+                is given since nothing downstream needs low latency.
+        """
         if self.is_recording:
             print("⚠️ Already recording!")
             return False
         
         print("🎙️ Starting recording...")
         self.is_recording = True
-        self.audio_buffer = []
+        
+        # Move existing objects out of GC tracking and make gen-0 collections rare
+        gc.freeze()
+        self._gc_threshold = gc.get_threshold()
+        gc.set_threshold(*_RECORDING_GC_THRESHOLD)
+        
+        self._nframes = 0
         self.chunk_callback = chunk_callback
         self.session_start = datetime.now()
         
-        # Start processing thread
-        self.recording_thread = threading.Thread(
-            target=self.process_audio_queue,
-            daemon=True
-        )
-        self.recording_thread.start()
+        # Open the WAV file up front; audio_callback appends to it
+        timestamp = self.session_start.strftime("%Y%m%d_%H%M%S")
+        self._filename = self.output_dir / f"meeting_{timestamp}.wav"
+        self._wf = open(self._filename, 'wb')
+        self._wf.write(wav_header(self.sample_rate, self.channels, 0))  # sizes patched on save
+        
+        if self.async_writes:
+            self._writer_thread = threading.Thread(
+                target=self._write_worker,
+                daemon=True
+            )
+            self._writer_thread.start()
+        
+        if blocksize is None:
+            if chunk_callback is None:
+                blocksize = self.sample_rate * 2
+            else:
+                blocksize = int(self.sample_rate * self.chunk_duration)
         
         # Start audio stream
         self.stream = sd.InputStream(
@@ -113,7 +210,7 @@ class AudioRecorder:
             channels=self.channels,
             samplerate=self.sample_rate,
             device=self.device,
-            blocksize=int(self.sample_rate * self.chunk_duration)
+            blocksize=blocksize
         )
         self.stream.start()
         
@@ -134,37 +231,38 @@ class AudioRecorder:
             self.stream.stop()
             self.stream.close()
         
-        # Wait for processing thread to finish
-        if self.recording_thread:
-            self.recording_thread.join(timeout=2.0)
+        # Flush pending writes
+        if self._writer_thread:
+            self._write_queue.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
+        
+        # Restore normal GC behaviour
+        if self._gc_threshold:
+            gc.set_threshold(*self._gc_threshold)
+            self._gc_threshold = None
+        gc.unfreeze()
         
-        # Save audio to file
-        if self.audio_buffer:
+        # Finalize audio file
+        if self._nframes:
             return self.save_audio()
         else:
+            self._wf.close()
+            self._wf = None
+            self._filename.unlink(missing_ok=True)
             print("⚠️ No audio data recorded")
             return None
     
     def save_audio(self) -> Path:
-        """Save recorded audio to WAV file"""
-        # Combine all audio chunks
-        audio_data = np.concatenate(self.audio_buffer, axis=0)
-        
-        # Generate filename with timestamp
-        timestamp = self.session_start.strftime("%Y%m%d_%H%M%S")
-        filename = self.output_dir / f"meeting_{timestamp}.wav"
-        
-        # Convert float32 to int16 for WAV
-        audio_int16 = (audio_data * 32767).astype(np.int16)
-        
-        # Save as WAV file
-        with wave.open(str(filename), 'wb') as wf:
-            wf.setnchannels(self.channels)
-            wf.setsampwidth(2)  # 16-bit
-            wf.setframerate(self.sample_rate)
-            wf.writeframes(audio_int16.tobytes())
+        """Finalize the streamed WAV file (patches the header sizes)"""
+        filename = self._filename
+        data_size = self._nframes * self.channels * 2
+        self._wf.seek(0)
+        self._wf.write(wav_header(self.sample_rate, self.channels, data_size))
+        self._wf.close()
+        self._wf = None
         
-        duration = len(audio_data) / self.sample_rate
+        duration = self._nframes / self.sample_rate
         print(f"✅ Audio saved: {filename}")
         print(f"📊 Duration: {duration:.1f} seconds")
         
@@ -180,7 +278,7 @@ class AudioRecorder:
         return {
             "is_recording": self.is_recording,
             "duration": duration,
-            "buffer_size": len(self.audio_buffer),
+            "buffer_size": self._nframes,
             "sample_rate": self.sample_rate
         }
 
@@ -198,8 +296,9 @@ def test_recording():
     
     # Enhanced chunk callback for testing with better visualization
     def test_callback(chunk, sample_rate):
-        # Calculate RMS (volume level)
-        rms = np.sqrt(np.mean(chunk**2))
+        # Calculate RMS (volume level) with one dot product, no squared temporary
+        samples = chunk.ravel()
+        rms = math.sqrt(float(np.dot(samples, samples)) / samples.size)
         # Scale for better visibility (adjust multiplier as needed)
         bars = int(rms * 500)  # Increased sensitivity
         max_bars = 50
@@ -3,12 +3,19 @@ Speaker Diarization Module
 Identifies different speakers in audio using pyannote
 """
 
+import io
 import os
+import json
+import struct
+import queue
+import hashlib
+import threading
 import torch
 import numpy as np
+from collections import OrderedDict, defaultdict
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 import warnings
 warnings.filterwarnings("ignore")
 
@@ -21,6 +28,33 @@ except ImportError:
     PYANNOTE_AVAILABLE = False
     print("⚠️ Pyannote not available. Install with: pip install pyannote.audio")
 
+# Numba is optional; without it the VAD helpers run as plain Python
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Mean signal power (normalized to [-1, 1]) below which a file is treated as silence
+SILENCE_POWER_THRESHOLD = 1e-6
+
+# Single-speaker shortcut: embeddings of up to SINGLE_SPEAKER_SAMPLES voiced
+# spans (SINGLE_SPEAKER_EMBED_SECONDS each) that are all at least this
+# cosine-similar mean one voice, so the full pipeline is skipped
+SINGLE_SPEAKER_SIMILARITY = 0.75
+SINGLE_SPEAKER_SAMPLES = 4
+SINGLE_SPEAKER_EMBED_SECONDS = 2.0
+
+# Rolling window used when diarizing while the meeting is still being recorded
+STREAM_WINDOW_SECONDS = 30.0
+STREAM_OVERLAP_SECONDS = 5.0
+
 @dataclass
 class SpeakerSegment:
     """Represents a speaker segment"""
@@ -34,6 +68,101 @@ class SpeakerSegment:
     def duration(self):
         return self.end_time - self.start_time
 
+
+def _wav_data_offset(audio_path: Path) -> int:
+    """Byte offset of the PCM payload in a RIFF/WAVE file"""
+    with open(audio_path, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f"Not a WAV file: {audio_path}")
+        
+        # Walk chunks until we hit 'data' (chunks are word-aligned)
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"No data chunk in {audio_path}")
+            chunk_id, size = struct.unpack('<4sI', header)
+            if chunk_id == b'data':
+                return f.tell()
+            f.seek(size + (size & 1), 1)
+
+
+def _enable_gpu_resampling():
+    """
+    Make pyannote resample on the GPU. Audio.downmix_and_resample runs
+    torchaudio's resampler on CPU, which becomes the single-core bottleneck
+    for 44.1/48 kHz files while the GPU idles. The wrapper moves the
+    waveform to CUDA only when a resample is actually needed and hands
+    the result back on CPU, where the rest of pyannote's I/O expects it.
+    """
+    from pyannote.audio.core.io import Audio
+    
+    original = Audio.downmix_and_resample
+    if getattr(original, "_gpu_resample", False):
+        return
+    
+    def downmix_and_resample(self, waveform, sample_rate):
+        if self.sample_rate is not None and self.sample_rate != sample_rate:
+            waveform, sample_rate = original(self, waveform.cuda(), sample_rate)
+            return waveform.cpu(), sample_rate
+        return original(self, waveform, sample_rate)
+    
+    downmix_and_resample._gpu_resample = True
+    Audio.downmix_and_resample = downmix_and_resample
+
+
+def _map_wav(audio_path: Path):
+    """Memory-map a 16-bit WAV's PCM payload; returns (samples, sample_rate)"""
+    import wave
+    
+    # Read audio header
+    with wave.open(str(audio_path), 'rb') as wf:
+        sample_rate = wf.getframerate()
+        n_samples = wf.getnframes() * wf.getnchannels()
+    
+    # Memory-map the int16 PCM payload (paged in on demand, no copies)
+    audio_np = np.memmap(
+        str(audio_path),
+        dtype='<i2',
+        mode='r',
+        offset=_wav_data_offset(audio_path),
+        shape=(n_samples,)
+    )
+    return audio_np, sample_rate
+
+
+@njit(cache=True)
+def _extract_segments(speech_frames, hop_length, sample_rate, min_duration):
+    """
+    Walk the smoothed speech mask and return start/end times (seconds)
+    of every speech run lasting at least min_duration
+    """
+    n = speech_frames.shape[0]
+    starts = np.empty(n, dtype=np.float64)
+    ends = np.empty(n, dtype=np.float64)
+    count = 0
+    in_speech = False
+    start_time = 0.0
+    
+    for i in range(n):
+        current_time = i * hop_length / sample_rate
+        
+        if speech_frames[i] and not in_speech:
+            # Start of speech segment
+            in_speech = True
+            start_time = current_time
+            
+        elif not speech_frames[i] and in_speech:
+            # End of speech segment
+            in_speech = False
+            if current_time - start_time >= min_duration:
+                starts[count] = start_time
+                ends[count] = current_time
+                count += 1
+    
+    return starts[:count], ends[:count]
+
+
 class SpeakerDiarizer:
     """
     Speaker diarization using pyannote or simple voice activity detection
@@ -43,13 +172,35 @@ class SpeakerDiarizer:
         self,
         auth_token: Optional[str] = None,
         min_speaker_duration: float = 0.5,
-        use_pyannote: bool = True
+        use_pyannote: bool = True,
+        use_fp16: bool = True,
+        segmentation_onnx: Optional[Path] = None,
+        compile_embedding: bool = True,
+        cache_dir: Optional[Path] = Path("outputs/diar_cache"),
+        cache_size: int = 32,
+        max_speakers: Optional[int] = None
     ):
         self.min_speaker_duration = min_speaker_duration
+        # max_speakers=1 always takes the single-speaker shortcut
+        self.max_speakers = max_speakers
+        
+        # Diarization results keyed by audio content + settings
+        # (in-memory LRU, persisted to cache_dir when set)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, List[SpeakerSegment]]" = OrderedDict()
         self.use_pyannote = use_pyannote and PYANNOTE_AVAILABLE
+        # Half precision only pays off on GPU
+        self.use_fp16 = use_fp16 and torch.cuda.is_available()
+        # Dedicated CUDA stream so pipeline kernels don't serialize on the default stream
+        self._cuda_stream = None
+        # torch.compile the per-segment embedding model (GPU only)
+        self.compile_embedding = compile_embedding
         
         if self.use_pyannote:
             self._initialize_pyannote(auth_token)
+            if self.use_pyannote and segmentation_onnx:
+                self._load_onnx_segmentation(Path(segmentation_onnx))
         else:
             print("📊 Using simple VAD-based speaker detection")
             self.pipeline = None
@@ -79,7 +230,14 @@ class SpeakerDiarizer:
             # Move to GPU if available
             if torch.cuda.is_available():
                 self.pipeline.to(torch.device("cuda"))
-                print("✅ Pyannote model loaded (GPU)")
+                self._cuda_stream = torch.cuda.Stream()
+                try:
+                    _enable_gpu_resampling()
+                except Exception as e:
+                    print(f"⚠️ GPU resampling unavailable: {e}")
+                if self.compile_embedding:
+                    self._compile_embedding_model()
+                print(f"✅ Pyannote model loaded (GPU{', fp16' if self.use_fp16 else ''})")
             else:
                 print("✅ Pyannote model loaded (CPU)")
                 
@@ -88,37 +246,193 @@ class SpeakerDiarizer:
             print("📊 Falling back to simple speaker detection")
             self.use_pyannote = False
     
+    def _compile_embedding_model(self):
+        """
+        Wrap pyannote's speaker embedding network in torch.compile; it runs
+        once per segment, so fused kernels add up. First call pays the compile.
+        """
+        if not hasattr(torch, "compile"):
+            return
+        
+        try:
+            embedding = self.pipeline._embedding
+            # Pretrained pyannote embeddings keep the network in `model_`
+            attr = "model_" if hasattr(embedding, "model_") else "model"
+            setattr(embedding, attr, torch.compile(
+                getattr(embedding, attr),
+                mode="reduce-overhead",
+                fullgraph=False
+            ))
+            print("✅ Embedding model compiled")
+        except Exception as e:
+            print(f"⚠️ Could not compile embedding model: {e}")
+    
+    def export_segmentation_onnx(self, onnx_path: Path, duration: float = 10.0) -> Path:
+        """
+        One-time export of pyannote's segmentation model (the dominant cost
+        of the pipeline) to ONNX with a dynamic time axis
+        """
+        segmentation = self.pipeline._segmentation
+        model = segmentation.model
+        onnx_path = Path(onnx_path)
+        onnx_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        print(f"🔄 Exporting segmentation model to {onnx_path}...")
+        num_samples = int(duration * model.hparams.sample_rate)
+        dummy = torch.zeros(1, model.hparams.num_channels, num_samples, device=model.device)
+        torch.onnx.export(
+            model,
+            dummy,
+            str(onnx_path),
+            input_names=["input"],
+            output_names=["output"],
+            dynamic_axes={
+                "input": {0: "batch", 2: "time"},
+                "output": {0: "batch", 1: "frames"}
+            },
+            opset_version=17
+        )
+        print("✅ Segmentation model exported")
+        return onnx_path
+    
+    def _load_onnx_segmentation(self, onnx_path: Path):
+        """
+        Swap pyannote's PyTorch segmentation inference for an ONNX Runtime
+        session (TensorRT > CUDA > CPU, whichever is available)
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            print("⚠️ onnxruntime not available. Install with: pip install onnxruntime-gpu")
+            return
+        
+        try:
+            if not onnx_path.exists():
+                self.export_segmentation_onnx(onnx_path)
+            
+            available = ort.get_available_providers()
+            providers = []
+            if "TensorrtExecutionProvider" in available:
+                providers.append(("TensorrtExecutionProvider", {
+                    "trt_fp16_enable": self.use_fp16,
+                    "trt_engine_cache_enable": True,
+                    "trt_engine_cache_path": str(onnx_path.parent)
+                }))
+            if "CUDAExecutionProvider" in available:
+                providers.append("CUDAExecutionProvider")
+            providers.append("CPUExecutionProvider")
+            
+            session = ort.InferenceSession(str(onnx_path), providers=providers)
+            segmentation = self.pipeline._segmentation
+            
+            def infer(chunks: torch.Tensor) -> np.ndarray:
+                scores = session.run(None, {"input": chunks.cpu().numpy()})[0]
+                # Same powerset -> multilabel conversion pyannote applies
+                scores = torch.from_numpy(scores).to(segmentation.device)
+                return segmentation.conversion(scores).cpu().numpy()
+            
+            segmentation.infer = infer
+            print(f"✅ ONNX segmentation loaded ({session.get_providers()[0]})")
+            
+        except Exception as e:
+            print(f"⚠️ Could not load ONNX segmentation: {e}")
+            print("📊 Using PyTorch segmentation")
+    
     def diarize_audio(self, audio_path: Path) -> List[SpeakerSegment]:
         """
         Perform speaker diarization on audio file
+        Results are cached by file content, so repeat calls are free
         """
-        if self.use_pyannote and self.pipeline:
-            return self._diarize_with_pyannote(audio_path)
-        else:
-            return self._diarize_with_vad(audio_path)
+        use_pyannote = bool(self.use_pyannote and self.pipeline)
+        cache_key = self._cache_key(audio_path, use_pyannote)
+        
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            print(f"✅ Using cached diarization ({len(cached)} segments)")
+            return cached
+        
+        segments = self._diarize_with_pyannote(audio_path) if use_pyannote else None
+        if segments is None:
+            if use_pyannote:
+                # Pyannote failed: cache the fallback under the VAD key so
+                # pyannote is retried on the next call
+                cache_key = self._cache_key(audio_path, False)
+                cached = self._get_cached(cache_key)
+                if cached is not None:
+                    return cached
+            segments = self._diarize_with_vad(audio_path)
+        
+        # Empty results usually mean an error; don't pin them
+        if segments:
+            self._put_cached(cache_key, segments)
+        return segments
+    
+    def _cache_key(self, audio_path: Path, use_pyannote: bool) -> str:
+        """SHA-256 of the audio bytes plus the settings that affect the result"""
+        digest = hashlib.sha256()
+        with open(audio_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        
+        backend = "pyannote" if use_pyannote else "vad"
+        digest.update(f"|{backend}|{self.min_speaker_duration}|{self.max_speakers}".encode())
+        return digest.hexdigest()
+    
+    def _get_cached(self, key: str) -> Optional[List[SpeakerSegment]]:
+        """Look up a result in memory, then on disk"""
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return list(self._cache[key])
+        
+        if self.cache_dir:
+            cache_file = self.cache_dir / f"{key}.json"
+            if cache_file.exists():
+                try:
+                    with open(cache_file, 'r', encoding='utf-8') as f:
+                        segments = [SpeakerSegment(**d) for d in json.load(f)]
+                    self._remember(key, segments)
+                    return list(segments)
+                except Exception as e:
+                    print(f"⚠️ Ignoring unreadable diarization cache: {e}")
+        
+        return None
+    
+    def _put_cached(self, key: str, segments: List[SpeakerSegment]):
+        """Store a result in memory and on disk"""
+        self._remember(key, list(segments))
+        
+        if self.cache_dir:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                with open(self.cache_dir / f"{key}.json", 'w', encoding='utf-8') as f:
+                    json.dump([asdict(s) for s in segments], f)
+            except Exception as e:
+                print(f"⚠️ Could not write diarization cache: {e}")
+    
+    def _remember(self, key: str, segments: List[SpeakerSegment]):
+        """Insert into the in-memory LRU, evicting the oldest entry"""
+        self._cache[key] = segments
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
     
-    def _diarize_with_pyannote(self, audio_path: Path) -> List[SpeakerSegment]:
-        """Use pyannote for speaker diarization"""
+    def _diarize_with_pyannote(self, audio_path: Path) -> Optional[List[SpeakerSegment]]:
+        """Use pyannote for speaker diarization (None on failure)"""
         print("🎯 Performing speaker diarization with pyannote...")
         
         try:
-            # Run diarization
-            diarization = self.pipeline(str(audio_path))
-            
-            # Convert to speaker segments
-            segments = []
-            for turn, _, speaker in diarization.itertracks(yield_label=True):
-                if turn.duration >= self.min_speaker_duration:
-                    segment = SpeakerSegment(
-                        speaker_id=speaker,
-                        start_time=turn.start,
-                        end_time=turn.end,
-                        confidence=1.0
-                    )
-                    segments.append(segment)
+            try:
+                audio_np, sample_rate = _map_wav(audio_path)
+                segments = self._single_speaker_segments(audio_np, sample_rate, 32768.0)
+            except Exception as e:
+                # Not a 16-bit WAV; pyannote decodes other formats itself
+                print(f"⚠️ Skipping single-speaker check: {e}")
+                segments = None
+            if segments is not None:
+                print(f"👤 Single speaker detected, skipped full diarization ({len(segments)} segments)")
+                return segments
             
-            # Sort by start time
-            segments.sort(key=lambda x: x.start_time)
+            segments = self._pyannote_segments(str(audio_path))
             
             print(f"✅ Found {len(set(s.speaker_id for s in segments))} speakers")
             print(f"📊 Total segments: {len(segments)}")
@@ -127,7 +441,103 @@ class SpeakerDiarizer:
             
         except Exception as e:
             print(f"❌ Pyannote error: {e}")
-            return self._diarize_with_vad(audio_path)
+            return None
+    
+    def _pyannote_segments(self, audio) -> List[SpeakerSegment]:
+        """Run the pipeline on a file path or {"waveform", "sample_rate"} dict"""
+        # Run diarization (no autograd; fp16 autocast and own stream on GPU)
+        with torch.inference_mode(), torch.autocast("cuda", dtype=torch.float16, enabled=self.use_fp16):
+            if self._cuda_stream is not None:
+                with torch.cuda.stream(self._cuda_stream):
+                    diarization = self.pipeline(audio)
+                self._cuda_stream.synchronize()
+            else:
+                diarization = self.pipeline(audio)
+        
+        # Convert to speaker segments
+        segments = []
+        for turn, _, speaker in diarization.itertracks(yield_label=True):
+            if turn.duration >= self.min_speaker_duration:
+                segment = SpeakerSegment(
+                    speaker_id=speaker,
+                    start_time=turn.start,
+                    end_time=turn.end,
+                    confidence=1.0
+                )
+                segments.append(segment)
+        
+        # Sort by start time
+        segments.sort(key=lambda x: x.start_time)
+        return segments
+    
+    def diarize_chunk(self, audio: np.ndarray, sample_rate: int, offset: float = 0.0) -> List[SpeakerSegment]:
+        """
+        Diarize an in-memory mono float32 buffer (not cached).
+        Segment times are shifted by `offset` seconds.
+        """
+        segments = None
+        if self.use_pyannote and self.pipeline:
+            try:
+                segments = self._single_speaker_segments(audio, sample_rate, 1.0)
+                if segments is None:
+                    waveform = torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32))[None]
+                    segments = self._pyannote_segments({"waveform": waveform, "sample_rate": sample_rate})
+            except Exception as e:
+                print(f"❌ Pyannote error: {e}")
+        
+        if segments is None:
+            segments = self._vad_segments(audio, sample_rate, 1.0)
+        
+        for segment in segments:
+            segment.start_time += offset
+            segment.end_time += offset
+        return segments
+    
+    def _single_speaker_segments(self, audio_np: np.ndarray, sample_rate: int, full_scale: float) -> Optional[List[SpeakerSegment]]:
+        """
+        Cheap gate before the full pipeline: if the voiced spans all come from
+        one speaker (or max_speakers is 1), return them as SPEAKER_00.
+        Returns None when the full pipeline should run.
+        """
+        voiced = self._vad_segments(audio_np, sample_rate, full_scale)
+        if not voiced:
+            return [] if self.max_speakers == 1 else None
+        if self.max_speakers != 1 and not self._same_speaker(audio_np, sample_rate, full_scale, voiced):
+            return None
+        
+        return [
+            SpeakerSegment(
+                speaker_id="SPEAKER_00",
+                start_time=s.start_time,
+                end_time=s.end_time,
+                confidence=1.0
+            )
+            for s in voiced
+        ]
+    
+    def _same_speaker(self, audio_np: np.ndarray, sample_rate: int, full_scale: float, voiced: List[SpeakerSegment]) -> bool:
+        """Compare embeddings of a few evenly spread voiced spans"""
+        span = int(SINGLE_SPEAKER_EMBED_SECONDS * sample_rate)
+        candidates = [s for s in voiced if (s.end_time - s.start_time) * sample_rate >= span]
+        if len(candidates) < 2:
+            return False
+        
+        picks = np.unique(np.linspace(0, len(candidates) - 1, SINGLE_SPEAKER_SAMPLES).round().astype(int))
+        starts = [int(candidates[i].start_time * sample_rate) for i in picks]
+        crops = np.stack([audio_np[start:start + span] for start in starts]).astype(np.float32)
+        crops *= 1.0 / full_scale
+        
+        try:
+            with torch.inference_mode():
+                embeddings = np.asarray(self.pipeline._embedding(torch.from_numpy(crops)[:, None]))
+        except Exception as e:
+            print(f"⚠️ Single-speaker check failed: {e}")
+            return False
+        
+        if not np.all(np.isfinite(embeddings)):
+            return False
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return float(np.min(embeddings @ embeddings.T)) >= SINGLE_SPEAKER_SIMILARITY
     
     def _diarize_with_vad(self, audio_path: Path) -> List[SpeakerSegment]:
         """
@@ -136,73 +546,12 @@ class SpeakerDiarizer:
         """
         print("🎯 Performing simple speaker segmentation...")
         
-        import wave
-        import scipy.signal as signal
-        
         try:
-            # Read audio file
-            with wave.open(str(audio_path), 'rb') as wf:
-                sample_rate = wf.getframerate()
-                n_frames = wf.getnframes()
-                audio_data = wf.readframes(n_frames)
-                
-            # Convert to numpy array
-            audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
-            
-            # Simple energy-based VAD
-            frame_length = int(0.025 * sample_rate)  # 25ms frames
-            hop_length = int(0.010 * sample_rate)    # 10ms hop
+            audio_np, sample_rate = _map_wav(audio_path)
             
-            # Calculate energy for each frame
-            energies = []
-            for i in range(0, len(audio_np) - frame_length, hop_length):
-                frame = audio_np[i:i + frame_length]
-                energy = np.sum(frame ** 2) / frame_length
-                energies.append(energy)
-            
-            energies = np.array(energies)
-            
-            # Threshold for speech detection
-            energy_threshold = np.mean(energies) + 0.5 * np.std(energies)
-            
-            # Detect speech segments
-            speech_frames = energies > energy_threshold
-            
-            # Apply median filter to smooth
-            speech_frames = signal.medfilt(speech_frames.astype(float), kernel_size=21).astype(bool)
-            
-            # Find speech segments
-            segments = []
-            in_speech = False
-            start_time = 0
-            speaker_count = 0
-            
-            for i, is_speech in enumerate(speech_frames):
-                current_time = i * hop_length / sample_rate
-                
-                if is_speech and not in_speech:
-                    # Start of speech segment
-                    in_speech = True
-                    start_time = current_time
-                    
-                elif not is_speech and in_speech:
-                    # End of speech segment
-                    in_speech = False
-                    end_time = current_time
-                    
-                    # Add segment if long enough
-                    if end_time - start_time >= self.min_speaker_duration:
-                        # Simple speaker alternation (not real diarization)
-                        speaker_id = f"SPEAKER_{(speaker_count % 2) + 1}"
-                        speaker_count += 1
-                        
-                        segment = SpeakerSegment(
-                            speaker_id=speaker_id,
-                            start_time=start_time,
-                            end_time=end_time,
-                            confidence=0.7  # Lower confidence for VAD
-                        )
-                        segments.append(segment)
+            segments = self._vad_segments(audio_np, sample_rate, 32768.0)
+            if not segments:
+                return []
             
             print(f"✅ Found {len(segments)} speech segments")
             print("⚠️ Note: Using simple VAD - speakers may not be accurately identified")
@@ -213,6 +562,57 @@ class SpeakerDiarizer:
             print(f"❌ VAD error: {e}")
             return []
     
+    def _vad_segments(self, audio_np: np.ndarray, sample_rate: int, full_scale: float) -> List[SpeakerSegment]:
+        """
+        Energy-based speech segmentation of a mono buffer whose samples
+        span [-full_scale, full_scale] (32768 for int16 PCM, 1 for float)
+        """
+        from scipy.ndimage import median_filter
+        
+        # Early exit on (near-)silent recordings: one pass for mean power
+        n_samples = len(audio_np)
+        mean_power = np.einsum('i,i->', audio_np, audio_np, dtype=np.float64) / (max(n_samples, 1) * full_scale ** 2)
+        if mean_power < SILENCE_POWER_THRESHOLD:
+            print("🔇 Audio is near-silent, no speech segments")
+            return []
+        
+        # Simple energy-based VAD
+        frame_length = int(0.025 * sample_rate)  # 25ms frames
+        hop_length = int(0.010 * sample_rate)    # 10ms hop
+        if n_samples < frame_length:
+            return []
+        
+        # Calculate energy for each frame (strided view, no copies).
+        # einsum accumulates in float64 and the sample scale is folded in here.
+        frames = np.lib.stride_tricks.sliding_window_view(audio_np, frame_length)[::hop_length]
+        energies = np.einsum('ij,ij->i', frames, frames, dtype=np.float64) * (1.0 / (frame_length * full_scale ** 2))
+        
+        # Threshold for speech detection
+        energy_threshold = np.mean(energies) + 0.5 * np.std(energies)
+        
+        # Detect speech segments
+        speech_frames = energies > energy_threshold
+        
+        # Apply median filter to smooth (1-byte lanes; zero-padded edges like medfilt)
+        speech_frames = median_filter(speech_frames.view(np.uint8), size=21, mode='constant').astype(bool)
+        
+        # Find speech segments
+        starts, ends = _extract_segments(
+            speech_frames, hop_length, sample_rate, self.min_speaker_duration
+        )
+        
+        # Simple speaker alternation (not real diarization), labelled like
+        # pyannote (SPEAKER_00, SPEAKER_01)
+        return [
+            SpeakerSegment(
+                speaker_id=f"SPEAKER_{i % 2:02d}",
+                start_time=float(start_time),
+                end_time=float(end_time),
+                confidence=0.7  # Lower confidence for VAD
+            )
+            for i, (start_time, end_time) in enumerate(zip(starts, ends))
+        ]
+    
     def merge_with_transcript(
         self,
         speaker_segments: List[SpeakerSegment],
@@ -224,22 +624,22 @@ class SpeakerDiarizer:
         """
         print("🔄 Merging speakers with transcript...")
         
-        # Create a copy of speaker segments
+        # Sorted transcript start times for interval lookup
+        trans_times = np.array([getattr(s, 'timestamp', 0) for s in transcript_segments], dtype=np.float64)
+        order = np.argsort(trans_times, kind='stable')
+        trans_times = trans_times[order]
+        trans_texts = [getattr(transcript_segments[i], 'text', '') for i in order]
+        
+        # Transcript segments starting inside each speaker turn (inclusive)
+        speaker_starts = np.array([s.start_time for s in speaker_segments], dtype=np.float64)
+        speaker_ends = np.array([s.end_time for s in speaker_segments], dtype=np.float64)
+        lo = np.searchsorted(trans_times, speaker_starts, side='left')
+        hi = np.searchsorted(trans_times, speaker_ends, side='right')
+        
         merged_segments = []
         
-        for speaker_seg in speaker_segments:
-            # Find overlapping transcript segments
-            speaker_text = []
-            
-            for trans_seg in transcript_segments:
-                # Check if transcript segment overlaps with speaker segment
-                trans_time = getattr(trans_seg, 'timestamp', 0)
-                trans_duration = getattr(trans_seg, 'duration', 0)
-                
-                # Simple time-based matching (can be improved)
-                if (trans_time >= speaker_seg.start_time and 
-                    trans_time <= speaker_seg.end_time):
-                    speaker_text.append(getattr(trans_seg, 'text', ''))
+        for speaker_seg, start, end in zip(speaker_segments, lo, hi):
+            speaker_text = trans_texts[start:end]
             
             # Create merged segment
             merged_seg = SpeakerSegment(
@@ -260,47 +660,187 @@ class SpeakerDiarizer:
         """
         Format diarized transcript for display
         """
-        formatted = []
+        buf = io.StringIO()
         current_speaker = None
         
         for segment in segments:
             # Add speaker label if changed
             if segment.speaker_id != current_speaker:
-                formatted.append(f"\n[{segment.speaker_id}]:")
+                buf.write(f"\n[{segment.speaker_id}]:")
                 current_speaker = segment.speaker_id
             
             # Add text
             if segment.text:
-                formatted.append(segment.text)
+                buf.write(' ')
+                buf.write(segment.text)
         
-        return ' '.join(formatted)
+        return buf.getvalue()
     
     def get_speaker_statistics(self, segments: List[SpeakerSegment]) -> Dict:
         """
         Calculate speaking time statistics for each speaker
         """
-        stats = {}
+        stats = defaultdict(lambda: {
+            'total_time': 0.0,
+            'turn_count': 0,
+            'words_spoken': 0
+        })
         
         for segment in segments:
-            if segment.speaker_id not in stats:
-                stats[segment.speaker_id] = {
-                    'total_time': 0,
-                    'turn_count': 0,
-                    'words_spoken': 0
-                }
-            
-            stats[segment.speaker_id]['total_time'] += segment.duration
-            stats[segment.speaker_id]['turn_count'] += 1
+            speaker_stats = stats[segment.speaker_id]
+            speaker_stats['total_time'] += segment.duration
+            speaker_stats['turn_count'] += 1
             
             if segment.text:
-                stats[segment.speaker_id]['words_spoken'] += len(segment.text.split())
+                speaker_stats['words_spoken'] += len(segment.text.split())
         
         # Calculate percentages
         total_time = sum(s['total_time'] for s in stats.values())
         for speaker_stats in stats.values():
             speaker_stats['percentage'] = (speaker_stats['total_time'] / total_time * 100) if total_time > 0 else 0
         
-        return stats
+        return dict(stats)
+
+
+class StreamingDiarizer:
+    """
+    Diarizes audio in rolling windows while it is being recorded, so only
+    the final tail window is left to process once recording stops.
+    
+    Windows overlap; each window commits the segments between the overlap
+    midpoints, and its speaker labels are mapped onto earlier labels by how
+    much they coincide inside the overlap.
+    """
+    
+    def __init__(
+        self,
+        diarizer: SpeakerDiarizer,
+        sample_rate: int = 16000,
+        window_seconds: float = STREAM_WINDOW_SECONDS,
+        overlap_seconds: float = STREAM_OVERLAP_SECONDS
+    ):
+        self.diarizer = diarizer
+        self.sample_rate = sample_rate
+        self.window = int(window_seconds * sample_rate)
+        self.overlap = int(overlap_seconds * sample_rate)
+        
+        self.segments: List[SpeakerSegment] = []
+        self._queue = queue.Queue()
+        self._thread = None
+        
+        # Pending audio and the absolute sample index of its first sample
+        self._pending: List[np.ndarray] = []
+        self._pending_samples = 0
+        self._offset = 0
+        # Window labels -> session labels
+        self._next_label = 0
+    
+    def start(self):
+        """Start the background diarization thread"""
+        self.segments = []
+        self._pending = []
+        self._pending_samples = 0
+        self._offset = 0
+        self._next_label = 0
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+    
+    def add_audio(self, audio_chunk: np.ndarray):
+        """Queue a recorded chunk (non-blocking; safe from the audio callback)"""
+        self._queue.put(audio_chunk.reshape(-1))
+    
+    def stop(self) -> List[SpeakerSegment]:
+        """Process the remaining tail window and return all speaker segments"""
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        return self.segments
+    
+    def _worker(self):
+        """Accumulate queued audio and diarize each full window"""
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                break
+            self._pending.append(chunk)
+            self._pending_samples += len(chunk)
+            
+            if self._pending_samples >= self.window:
+                self._process(final=False)
+        
+        # Tail window (always: the previous window left its trailing
+        # half-overlap uncommitted)
+        if self._pending_samples:
+            self._process(final=True)
+    
+    def _process(self, final: bool):
+        """Diarize the pending buffer and commit its non-overlapping part"""
+        buffer = np.concatenate(self._pending)
+        start = self._offset / self.sample_rate
+        end = start + len(buffer) / self.sample_rate
+        half = self.overlap / (2 * self.sample_rate)
+        
+        # Commit from the midpoint of the leading overlap (none for the first
+        # window) to the midpoint of the trailing overlap (the end for the last)
+        commit_from = start + half if self._offset else start
+        commit_to = end if final else end - half
+        
+        try:
+            window_segments = self.diarizer.diarize_chunk(buffer, self.sample_rate, offset=start)
+        except Exception as e:
+            print(f"⚠️ Streaming diarization error: {e}")
+            window_segments = []
+        
+        labels = self._map_labels(window_segments, start, start + self.overlap / self.sample_rate)
+        
+        for segment in window_segments:
+            seg_start = max(segment.start_time, commit_from)
+            seg_end = min(segment.end_time, commit_to)
+            if seg_end - seg_start <= 0:
+                continue
+            speaker = labels[segment.speaker_id]
+            
+            # Join a turn that was split at the commit boundary
+            last = self.segments[-1] if self.segments else None
+            if last and last.speaker_id == speaker and seg_start - last.end_time < self.diarizer.min_speaker_duration:
+                last.end_time = max(last.end_time, seg_end)
+            elif seg_end - seg_start >= self.diarizer.min_speaker_duration:
+                self.segments.append(SpeakerSegment(
+                    speaker_id=speaker,
+                    start_time=seg_start,
+                    end_time=seg_end,
+                    confidence=segment.confidence
+                ))
+        
+        # Keep the trailing overlap for the next window
+        keep = min(self.overlap, len(buffer))
+        self._offset += len(buffer) - keep
+        self._pending = [buffer[len(buffer) - keep:]]
+        self._pending_samples = keep
+    
+    def _map_labels(self, window_segments: List[SpeakerSegment], overlap_start: float, overlap_end: float) -> Dict[str, str]:
+        """Map window-local labels to session labels by overlap with committed turns"""
+        shared = defaultdict(lambda: defaultdict(float))
+        for segment in window_segments:
+            for prev in reversed(self.segments):
+                if prev.end_time <= overlap_start:
+                    break
+                both = min(segment.end_time, prev.end_time, overlap_end) - max(segment.start_time, prev.start_time, overlap_start)
+                if both > 0:
+                    shared[segment.speaker_id][prev.speaker_id] += both
+        
+        labels = {}
+        used = set()
+        for label in dict.fromkeys(s.speaker_id for s in window_segments):
+            candidates = [(t, l) for l, t in shared[label].items() if l not in used]
+            if candidates:
+                labels[label] = max(candidates)[1]
+            else:
+                labels[label] = f"SPEAKER_{self._next_label:02d}"
+                self._next_label += 1
+            used.add(labels[label])
+        return labels
 
 
 def test_diarization():
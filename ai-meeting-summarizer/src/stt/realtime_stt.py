@@ -3,16 +3,21 @@ Real-Time Speech-to-Text Transcriber
 Supports both Whisper and Vosk for redundancy
 """
 
-import whisper
+from faster_whisper import WhisperModel, BatchedInferencePipeline, download_model
+import ctranslate2
 import numpy as np
 import json
 import queue
 import threading
 import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List, Dict, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from datetime import datetime
+from math import gcd
+from scipy.signal import resample_poly
 import warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
 
@@ -23,7 +28,79 @@ except ImportError:
     VOSK_AVAILABLE = False
     print("⚠️ Vosk not available, using Whisper only")
 
-@dataclass
+try:
+    import jiwer
+    JIWER_AVAILABLE = True
+except ImportError:
+    JIWER_AVAILABLE = False
+
+# Vosk emits a JSON string per result; orjson parses these several times faster
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Shortcuts for model_size; distil-large-v3 keeps large-v3's encoder with a
+# 2-layer decoder, so English decoding runs ~6x faster at similar WER
+WHISPER_MODEL_ALIASES = {
+    "distil-v3": "distil-large-v3",
+}
+
+# Whisper models expect 16 kHz mono input
+WHISPER_SAMPLE_RATE = 16000
+
+# Energy gate run before Whisper: 10 ms frames above this RMS count as voiced,
+# and windows with less than MIN_VOICED_SECONDS of voice skip the decode
+VAD_FRAME_SECONDS = 0.01
+VAD_RMS_THRESHOLD = 0.01
+MIN_VOICED_SECONDS = 0.3
+
+# Whisper re-runs once this much new audio has arrived; words are committed
+# when two consecutive passes agree on them (LocalAgreement-2)
+MIN_CHUNK_SECONDS = 1.0
+
+# Past this length the buffer is force-committed by the holdback rule below,
+# so a stretch of disagreeing hypotheses can't grow it without bound
+MAX_BUFFER_SECONDS = 15.0
+
+# Words ending within this many seconds of the window edge are not committed yet
+COMMIT_HOLDBACK_SECONDS = 1.0
+
+# Leftover audio quieter than this is not worth a final decode on stop
+FINAL_MIN_RMS = 1e-3
+
+# Windows at least this long use the batched GPU pipeline, which encodes up
+# to BATCH_SIZE speech chunks per forward pass. Live windows are trimmed to
+# about MAX_BUFFER_SECONDS, so only a real decode backlog (the decoder fell a
+# full window behind) or a long final flush gets here; ordinary windows keep
+# the sequential path whose segmentation LocalAgreement relies on
+BATCH_MIN_SECONDS = 2 * MAX_BUFFER_SECONDS
+BATCH_SIZE = 8
+
+# Pending audio chunks before the oldest are dropped (~30 s at the
+# recorder's default 1 s chunks)
+AUDIO_QUEUE_MAX_CHUNKS = 30
+
+# Undrained segments kept for pull-based consumers before the oldest are dropped
+OUTPUT_QUEUE_MAX_SEGMENTS = 200
+
+def _word_key(word: str) -> str:
+    """Normalise a Whisper word for hypothesis comparison"""
+    return word.strip().strip(".,!?;:\"'").lower()
+
+def _local_whisper_model(model_size: str) -> str:
+    """Local directory holding the converted model, downloaded on first use"""
+    # Converted CTranslate2 models are kept under the configured
+    # whisper_model_path (one directory per size), so later loads read local
+    # files without any Hugging Face Hub round-trips
+    from utils.config import get_config
+    model_dir = get_config().model.whisper_model_path / model_size
+    if not (model_dir / "model.bin").exists():
+        print(f"📥 Downloading Whisper model ({model_size}) to {model_dir}...")
+        download_model(model_size, output_dir=str(model_dir))
+    return str(model_dir)
+
+@dataclass(slots=True, frozen=True)
 class TranscriptionSegment:
     """Represents a segment of transcribed text"""
     text: str
@@ -32,6 +109,32 @@ class TranscriptionSegment:
     confidence: float = 1.0
     is_final: bool = True
 
+class TranscriptLog:
+    """
+    Append-only JSONL file of final segments, so the full transcript lives
+    on disk and only needs to be loaded when it is summarized
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+    
+    def append(self, segment: TranscriptionSegment):
+        """Write one segment as a JSON line"""
+        self._file.write(json.dumps(asdict(segment)) + "\n")
+    
+    def close(self):
+        """Flush and close the log"""
+        if not self._file.closed:
+            self._file.close()
+    
+    @staticmethod
+    def load(path: Path) -> List[TranscriptionSegment]:
+        """Read a transcript log back into segments"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return [TranscriptionSegment(**json_loads(line)) for line in f if line.strip()]
+
 class RealTimeTranscriber:
     """
     Real-time speech-to-text engine with multiple model support
@@ -40,7 +143,7 @@ class RealTimeTranscriber:
     def __init__(
         self,
         model_type: str = "whisper",  # "whisper" or "vosk"
-        model_size: str = "base",     # for whisper: tiny, base, small, medium
+        model_size: str = "base",     # for whisper: tiny, base, small, medium, distil-v3
         language: str = "en",
         sample_rate: int = 16000
     ):
@@ -52,9 +155,40 @@ class RealTimeTranscriber:
         self.full_transcript = []
         self.current_sentence = ""
         
-        # Audio buffer for Whisper (needs chunks of audio)
-        self.audio_buffer = []
-        self.buffer_duration = 5.0  # Process 5 seconds at a time for Whisper
+        # Final segment texts, kept alongside full_transcript for get_full_text
+        self._final_text_parts: List[str] = []
+        self._full_text_cache: Optional[str] = None
+        
+        # Preallocated audio buffer for Whisper (holds the unconfirmed tail);
+        # writes are a memcpy at the cursor, flushes pass a zero-copy view
+        self.min_chunk_duration = MIN_CHUNK_SECONDS
+        self._ring = np.empty(int(self.sample_rate * (MAX_BUFFER_SECONDS + 1.0)), dtype=np.float32)
+        self._write = 0
+        # Samples appended since the last Whisper pass started
+        self._new_samples = 0
+        # Unconfirmed words from the previous pass (LocalAgreement-2)
+        self._prev_words: List[str] = []
+        
+        # Scratch buffers for the Vosk float32 -> int16 conversion (grown on demand)
+        self._f_tmp = np.empty(self.sample_rate, dtype=np.float32)
+        self._i16_buf = np.empty(self.sample_rate, dtype=np.int16)
+        
+        # Rational resampling factors to Whisper's rate (1/1 means no resampling)
+        g = gcd(WHISPER_SAMPLE_RATE, self.sample_rate)
+        self._up, self._down = WHISPER_SAMPLE_RATE // g, self.sample_rate // g
+        
+        # WER normalisation pipeline, built once and reused by calculate_wer
+        if JIWER_AVAILABLE:
+            self._wer_transform = jiwer.Compose([
+                jiwer.ToLowerCase(),
+                jiwer.RemovePunctuation(),
+                jiwer.RemoveWhiteSpace(replace_by_space=True),
+                jiwer.RemoveMultipleSpaces(),
+                jiwer.Strip(),
+                jiwer.ReduceToListOfListOfWords()
+            ])
+        else:
+            self._wer_transform = None
         
         # Callback for UI updates
         self.transcript_callback = None
@@ -62,7 +196,21 @@ class RealTimeTranscriber:
         # Processing flags
         self.is_processing = False
         self.processing_thread = None
-        self.audio_queue = queue.Queue()
+        
+        # The processing thread runs its own event loop; audio arrives via
+        # call_soon_threadsafe, so an idle stream sleeps instead of polling.
+        # Bounded so a stalled consumer can't grow memory without limit;
+        # _enqueue drops the oldest chunk when full
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.audio_queue: Optional[asyncio.Queue] = None
+        
+        # Whisper decodes run here so audio ingest never waits on the model
+        self._decode_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper-decode")
+        self._decode_task: Optional[asyncio.Task] = None
+        
+        # Finished segments for pull-based consumers (see get_segment); only
+        # filled when no callback is set, and bounded in case nobody drains it
+        self.output_queue = queue.Queue(maxsize=OUTPUT_QUEUE_MAX_SEGMENTS)
         
         # Initialize the model
         self._initialize_model(model_size)
@@ -72,8 +220,44 @@ class RealTimeTranscriber:
     def _initialize_model(self, model_size: str):
         """Initialize STT model based on type"""
         if self.model_type == "whisper":
+            model_size = WHISPER_MODEL_ALIASES.get(model_size, model_size)
             print(f"🔄 Loading Whisper model ({model_size})...")
-            self.model = whisper.load_model(model_size)
+            # CTranslate2 backend with int8 weights; on GPU the activations run
+            # in fp16 (int8 keeps WER within ~0.5% of fp32 for base/small)
+            if ctranslate2.get_cuda_device_count() > 0:
+                device, compute_type = "cuda", "int8_float16"
+            else:
+                device, compute_type = "cpu", "int8"
+            try:
+                model_path = _local_whisper_model(model_size)
+            except Exception as e:
+                print(f"⚠️ Could not store model locally ({e}), using the Hugging Face cache")
+                model_path = model_size
+            self.model = WhisperModel(model_path, device=device, compute_type=compute_type)
+            
+            # On GPU, backlogged windows are decoded in batches (see _run_whisper)
+            self.batched_model = BatchedInferencePipeline(model=self.model) if device == "cuda" else None
+            
+            # Warm-up passes so the first live window doesn't pay for lazy
+            # allocations: silence through the VAD path loads Silero, then
+            # faint noise with the VAD off actually runs the encoder and a few
+            # decoder steps (silence alone would be dropped before the encoder)
+            segments, _ = self.model.transcribe(
+                np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32),
+                language=self.language,
+                beam_size=1,
+                vad_filter=True
+            )
+            list(segments)
+            noise = np.random.default_rng(0).normal(0.0, 0.01, WHISPER_SAMPLE_RATE).astype(np.float32)
+            segments, _ = self.model.transcribe(
+                noise,
+                language=self.language,
+                beam_size=1,
+                vad_filter=False,
+                max_new_tokens=4
+            )
+            list(segments)
             print("✅ Whisper model loaded")
             
         elif self.model_type == "vosk" and VOSK_AVAILABLE:
@@ -89,55 +273,165 @@ class RealTimeTranscriber:
         else:
             raise ValueError(f"Unsupported model type: {self.model_type}")
     
+    def _voiced_duration(self, audio: np.ndarray) -> float:
+        """Seconds of audio whose 10 ms frame RMS clears the VAD threshold"""
+        frame = int(self.sample_rate * VAD_FRAME_SECONDS)
+        n_frames = len(audio) // frame
+        if n_frames == 0:
+            return 0.0
+        frames = audio[:n_frames * frame].reshape(n_frames, frame)
+        energy = np.einsum('ij,ij->i', frames, frames)
+        voiced = np.count_nonzero(energy > (VAD_RMS_THRESHOLD ** 2) * frame)
+        return voiced * VAD_FRAME_SECONDS
+    
+    def _run_whisper(self, audio: np.ndarray, word_timestamps: bool = False) -> list:
+        """Run Whisper on a float32 buffer and return its segments"""
+        # Silent windows never reach the encoder
+        if self._voiced_duration(audio) < MIN_VOICED_SECONDS:
+            return []
+        
+        if self._up != self._down:
+            audio = resample_poly(audio, self._up, self._down).astype(np.float32, copy=False)
+        
+        # A window past BATCH_MIN_SECONDS means decoding fell behind; split it
+        # into speech chunks and encode them in one batched pass instead
+        if self.batched_model is not None and len(audio) >= BATCH_MIN_SECONDS * WHISPER_SAMPLE_RATE:
+            segments, _ = self.batched_model.transcribe(
+                audio,
+                language=self.language,
+                beam_size=1,
+                batch_size=BATCH_SIZE,
+                vad_parameters=dict(min_silence_duration_ms=200),
+                word_timestamps=word_timestamps
+            )
+            return list(segments)
+        
+        # Silero VAD inside faster-whisper drops the silent spans before encoding
+        segments, _ = self.model.transcribe(
+            audio,
+            language=self.language,
+            beam_size=1,
+            vad_filter=True,
+            vad_parameters=dict(min_silence_duration_ms=200),
+            word_timestamps=word_timestamps
+        )
+        return list(segments)
+    
+    def _transcribe(self, audio: np.ndarray) -> str:
+        """Run Whisper on a float32 buffer and return the joined text"""
+        return " ".join(seg.text.strip() for seg in self._run_whisper(audio)).strip()
+    
+    def _transcribe_committed(self, audio: np.ndarray):
+        """
+        Transcribe a window and commit the words this pass and the previous one
+        agree on (LocalAgreement-2). Over MAX_BUFFER_SECONDS, words ending well
+        before the window edge are committed regardless.
+        Returns (committed text, sample offset where the uncommitted tail starts).
+        """
+        words = [w for seg in self._run_whisper(audio, word_timestamps=True) for w in seg.words]
+        keys = [_word_key(w.word) for w in words]
+        
+        # Longest common prefix with the previous hypothesis; the buffer was
+        # trimmed right after the last commit, so both start at the same word
+        agreed = 0
+        for key, prev in zip(keys, self._prev_words):
+            if key != prev:
+                break
+            agreed += 1
+        committed = words[:agreed]
+        
+        # Words near the window edge may be cut off, so they are re-decoded next time
+        if len(audio) >= MAX_BUFFER_SECONDS * self.sample_rate:
+            horizon = len(audio) / self.sample_rate - COMMIT_HOLDBACK_SECONDS
+            while len(committed) < len(words) and words[len(committed)].end <= horizon:
+                committed.append(words[len(committed)])
+        
+        self._prev_words = keys[len(committed):]
+        
+        if committed:
+            cut = int(committed[-1].end * self.sample_rate)
+        elif words:
+            cut = int(words[0].start * self.sample_rate)
+        else:
+            # Nothing recognised: keep a short tail in case speech is just starting
+            cut = len(audio) - int(self.sample_rate * COMMIT_HOLDBACK_SECONDS)
+        
+        cut = min(max(cut, 0), len(audio))
+        return "".join(w.word for w in committed).strip(), cut
+    
+    def _to_int16(self, audio_chunk: np.ndarray) -> np.ndarray:
+        """Scale float32 audio to int16 PCM without per-chunk temporaries"""
+        n = len(audio_chunk)
+        if n > len(self._i16_buf):
+            self._f_tmp = np.empty(n, dtype=np.float32)
+            self._i16_buf = np.empty(n, dtype=np.int16)
+        
+        tmp = self._f_tmp[:n]
+        np.multiply(audio_chunk, 32767.0, out=tmp)
+        np.clip(tmp, -32768.0, 32767.0, out=tmp)
+        np.rint(tmp, out=tmp)
+        
+        audio_int16 = self._i16_buf[:n]
+        audio_int16[:] = tmp
+        return audio_int16
+    
+    def _append_audio(self, audio_chunk: np.ndarray):
+        """Copy a chunk into the Whisper buffer at the write cursor"""
+        n = len(audio_chunk)
+        if self._write + n > len(self._ring):
+            self._ring = np.resize(self._ring, max(2 * len(self._ring), self._write + n))
+        self._ring[self._write:self._write + n] = audio_chunk
+        self._write += n
+        self._new_samples += n
+    
+    def _window_ready(self) -> bool:
+        """True once enough new audio has arrived for another Whisper pass"""
+        return self._new_samples >= self.min_chunk_duration * self.sample_rate
+    
+    def _decode(self, window: np.ndarray):
+        """Transcribe a window; returns (text, carryover cut) and never raises"""
+        try:
+            return self._transcribe_committed(window)
+        except Exception as e:
+            print(f"❌ Whisper error: {e}")
+            return "", len(window) - min(int(self.sample_rate * COMMIT_HOLDBACK_SECONDS), len(window))
+    
+    def _consume(self, cut: int):
+        """Drop buffered audio before `cut`, keeping only the uncommitted tail"""
+        # Carry over only the uncommitted tail, so finalized audio is never re-encoded
+        keep_samples = self._write - cut
+        self._ring[:keep_samples] = self._ring[cut:self._write]
+        self._write = keep_samples
+    
     def process_audio_chunk(self, audio_chunk: np.ndarray) -> Optional[str]:
         """Process a single audio chunk and return transcription"""
         
         if self.model_type == "whisper":
             # Whisper needs accumulated audio (not single chunks)
-            self.audio_buffer.append(audio_chunk)
+            self._append_audio(audio_chunk)
             
             # Check if we have enough audio to process
-            buffer_size = len(self.audio_buffer) * len(audio_chunk) / self.sample_rate
-            
-            if buffer_size >= self.buffer_duration:
-                # Combine buffered audio
-                combined_audio = np.concatenate(self.audio_buffer)
-                
-                # Clear buffer but keep last second for context
-                keep_samples = int(self.sample_rate * 1.0)  # Keep 1 second
-                if len(combined_audio) > keep_samples:
-                    self.audio_buffer = [combined_audio[-keep_samples:]]
-                else:
-                    self.audio_buffer = []
+            if self._window_ready():
+                self._new_samples = 0
+                text, cut = self._decode(self._ring[:self._write])
+                self._consume(cut)
                 
-                # Transcribe with Whisper
-                try:
-                    result = self.model.transcribe(
-                        combined_audio,
-                        language=self.language,
-                        fp16=False,
-                        verbose=False
-                    )
-                    
-                    text = result["text"].strip()
-                    if text:
-                        return text
-                except Exception as e:
-                    print(f"❌ Whisper error: {e}")
+                if text:
+                    return text
                     
         elif self.model_type == "vosk" and VOSK_AVAILABLE:
             # Vosk processes chunks directly
-            # Convert float32 to int16 for Vosk
-            audio_int16 = (audio_chunk * 32767).astype(np.int16)
+            # Convert float32 to int16 for Vosk (into reused buffers)
+            audio_int16 = self._to_int16(audio_chunk)
             
             if self.recognizer.AcceptWaveform(audio_int16.tobytes()):
-                result = json.loads(self.recognizer.Result())
+                result = json_loads(self.recognizer.Result())
                 text = result.get("text", "").strip()
                 if text:
                     return text
             else:
                 # Partial result
-                partial = json.loads(self.recognizer.PartialResult())
+                partial = json_loads(self.recognizer.PartialResult())
                 partial_text = partial.get("partial", "").strip()
                 if partial_text and len(partial_text) > len(self.current_sentence):
                     self.current_sentence = partial_text
@@ -154,122 +448,218 @@ class RealTimeTranscriber:
         self.is_processing = True
         self.transcript_callback = callback
         self.full_transcript = []
-        self.audio_buffer = []
+        self._final_text_parts = []
+        self._full_text_cache = None
+        # Drop segments left over from the previous recording
+        while self.get_segment() is not None:
+            pass
+        self._write = 0
+        self._new_samples = 0
+        self._prev_words = []
+        self._decode_task = None
+        self._loop = asyncio.new_event_loop()
+        self.audio_queue = asyncio.Queue(maxsize=AUDIO_QUEUE_MAX_CHUNKS)
         
         # Start processing thread
         self.processing_thread = threading.Thread(
-            target=self._process_audio_stream,
+            target=self._run_loop,
             daemon=True
         )
         self.processing_thread.start()
         
         print("🎙️ Real-time transcription started")
     
-    def _process_audio_stream(self):
-        """Process audio stream in background thread"""
-        while self.is_processing:
+    def _emit(self, transcription: str, duration: float):
+        """Wrap a transcription in a segment and publish it to consumers"""
+        # Handle partial vs final transcriptions
+        if "[PARTIAL]" in transcription:
+            # Update partial transcription
+            text = transcription.replace("[PARTIAL]", "").strip()
+            segment = TranscriptionSegment(
+                text=text,
+                timestamp=time.time(),
+                duration=0,
+                is_final=False
+            )
+        else:
+            # Final transcription
+            segment = TranscriptionSegment(
+                text=transcription,
+                timestamp=time.time(),
+                duration=duration,
+                is_final=True
+            )
+            
+            # Add to full transcript
+            self._add_final(segment)
+            self.current_sentence = ""
+        
+        # Send to callback if provided, otherwise queue for get_segment
+        if self.transcript_callback:
+            self.transcript_callback(segment)
+        else:
+            self._put_segment(segment)
+    
+    def _put_segment(self, segment: TranscriptionSegment):
+        """Queue a segment for get_segment, evicting the oldest when full"""
+        while True:
             try:
-                # Get audio from queue
-                audio_chunk = self.audio_queue.get(timeout=0.1)
+                self.output_queue.put_nowait(segment)
+                return
+            except queue.Full:
+                self.get_segment()
+    
+    def _run_loop(self):
+        """Processing thread body: drive the stream coroutine to completion"""
+        try:
+            self._loop.run_until_complete(self._process_audio_stream())
+        finally:
+            self._loop.close()
+    
+    async def _decode_window(self):
+        """Decode the buffered window on the pool, then apply its carryover cut"""
+        window = self._ring[:self._write].copy()
+        self._new_samples = 0
+        try:
+            text, cut = await self._loop.run_in_executor(self._decode_pool, self._decode, window)
+            # Back on the loop thread, so the buffer keeps a single writer
+            self._consume(cut)
+            if text:
+                self._emit(text, len(window) / self.sample_rate)
+        except Exception as e:
+            print(f"❌ Processing error: {e}")
+        finally:
+            self._decode_task = None
+    
+    async def _process_audio_stream(self):
+        """Process audio stream on the processing thread's event loop"""
+        while True:
+            # Wait for audio; None is the shutdown sentinel
+            audio_chunk = await self.audio_queue.get()
+            if audio_chunk is None:
+                break
+            
+            try:
+                if self.model_type == "whisper":
+                    # Ingest only; Whisper runs on the decode pool so a slow
+                    # window never stops the queue from draining
+                    self._append_audio(audio_chunk)
+                    if self._decode_task is None and self._window_ready():
+                        self._decode_task = asyncio.create_task(self._decode_window())
+                    continue
                 
                 # Process the chunk
                 transcription = self.process_audio_chunk(audio_chunk)
                 
                 if transcription:
-                    # Handle partial vs final transcriptions
-                    if "[PARTIAL]" in transcription:
-                        # Update partial transcription
-                        text = transcription.replace("[PARTIAL]", "").strip()
-                        segment = TranscriptionSegment(
-                            text=text,
-                            timestamp=time.time(),
-                            duration=0,
-                            is_final=False
-                        )
-                    else:
-                        # Final transcription
-                        segment = TranscriptionSegment(
-                            text=transcription,
-                            timestamp=time.time(),
-                            duration=len(audio_chunk) / self.sample_rate,
-                            is_final=True
-                        )
-                        
-                        # Add to full transcript
-                        self.full_transcript.append(segment)
-                        self.current_sentence = ""
-                    
-                    # Send to callback if provided
-                    if self.transcript_callback:
-                        self.transcript_callback(segment)
+                    self._emit(transcription, len(audio_chunk) / self.sample_rate)
                         
-            except queue.Empty:
-                continue
             except Exception as e:
                 print(f"❌ Processing error: {e}")
+        
+        # Let an in-flight window finish so its committed audio is not re-decoded
+        if self._decode_task is not None:
+            await self._decode_task
+    
+    def get_segment(self) -> Optional[TranscriptionSegment]:
+        """Pop the next transcribed segment without blocking (None if empty)"""
+        try:
+            return self.output_queue.get_nowait()
+        except queue.Empty:
+            return None
+    
+    def _enqueue(self, audio_chunk: Optional[np.ndarray]):
+        """Queue a chunk on the loop thread, evicting the oldest when full"""
+        while True:
+            try:
+                self.audio_queue.put_nowait(audio_chunk)
+                return
+            except asyncio.QueueFull:
+                self.audio_queue.get_nowait()
     
     def add_audio(self, audio_chunk: np.ndarray):
         """Add audio chunk to processing queue"""
         if self.is_processing:
-            self.audio_queue.put(audio_chunk)
+            try:
+                self._loop.call_soon_threadsafe(self._enqueue, audio_chunk)
+            except RuntimeError:
+                pass  # loop already shut down
     
     def stop_transcription(self) -> List[TranscriptionSegment]:
         """Stop transcription and return full transcript"""
         print("⏹️ Stopping transcription...")
+        was_processing = self.is_processing
         self.is_processing = False
         
-        if self.processing_thread:
-            self.processing_thread.join(timeout=2.0)
+        # The stream coroutine drains queued audio and any in-flight decode
+        # before exiting, so wait for it rather than racing the buffer
+        if was_processing and self.processing_thread:
+            self._loop.call_soon_threadsafe(self._enqueue, None)
+            self.processing_thread.join()
         
-        # Process any remaining audio in buffer
-        if self.model_type == "whisper" and self.audio_buffer:
-            combined_audio = np.concatenate(self.audio_buffer)
+        # Process any remaining audio in buffer, unless it is too short or quiet
+        # to hold speech (saves a full encoder pass at shutdown)
+        if self.model_type == "whisper" and self._write >= MIN_VOICED_SECONDS * self.sample_rate:
+            combined_audio = self._ring[:self._write]
+            rms = np.sqrt(combined_audio @ combined_audio / len(combined_audio))
+        else:
+            combined_audio, rms = None, 0.0
+        
+        if combined_audio is not None and rms >= FINAL_MIN_RMS:
             try:
-                result = self.model.transcribe(
-                    combined_audio,
-                    language=self.language,
-                    fp16=False,
-                    verbose=False
-                )
-                
-                text = result["text"].strip()
+                text = self._transcribe(combined_audio)
                 if text:
                     segment = TranscriptionSegment(
                         text=text,
                         timestamp=time.time(),
                         duration=len(combined_audio) / self.sample_rate
                     )
-                    self.full_transcript.append(segment)
+                    self._add_final(segment)
             except Exception as e:
                 print(f"❌ Final transcription error: {e}")
         
         print(f"✅ Transcription complete: {len(self.full_transcript)} segments")
         return self.full_transcript
     
+    def _add_final(self, segment: TranscriptionSegment):
+        """Record a final segment and invalidate the cached full text"""
+        self.full_transcript.append(segment)
+        self._final_text_parts.append(segment.text)
+        self._full_text_cache = None
+    
     def get_full_text(self) -> str:
         """Get complete transcript as text"""
-        return " ".join([seg.text for seg in self.full_transcript if seg.is_final])
+        if self._full_text_cache is None:
+            self._full_text_cache = " ".join(self._final_text_parts)
+        return self._full_text_cache
     
     def get_formatted_transcript(self) -> str:
         """Get formatted transcript with timestamps"""
         formatted = []
+        # Local clock time via integer math; the UTC offset is looked up once
+        utc_offset = int(datetime.now().astimezone().utcoffset().total_seconds())
         for seg in self.full_transcript:
             if seg.is_final:
-                timestamp = datetime.fromtimestamp(seg.timestamp).strftime("%H:%M:%S")
-                formatted.append(f"[{timestamp}] {seg.text}")
+                t = int(seg.timestamp) + utc_offset
+                h, m, s = t // 3600 % 24, t // 60 % 60, t % 60
+                formatted.append(f"[{h:02d}:{m:02d}:{s:02d}] {seg.text}")
         
         return "\n".join(formatted)
     
     def calculate_wer(self, reference_text: str) -> float:
         """Calculate Word Error Rate for evaluation"""
-        try:
-            from jiwer import wer
-            hypothesis = self.get_full_text()
-            if hypothesis and reference_text:
-                error_rate = wer(reference_text, hypothesis)
-                return error_rate
-        except ImportError:
+        if not JIWER_AVAILABLE:
             print("⚠️ jiwer not installed, cannot calculate WER")
+            return -1.0
+        
+        hypothesis = self.get_full_text()
+        if hypothesis and reference_text:
+            return jiwer.wer(
+                reference_text,
+                hypothesis,
+                reference_transform=self._wer_transform,
+                hypothesis_transform=self._wer_transform
+            )
         return -1.0
 
 
@@ -293,6 +683,7 @@ def test_live_transcription():
     
     # Transcript display
     transcript_lines = []
+    last_meter_ts = 0.0
     
     def transcription_callback(segment: TranscriptionSegment):
         """Callback to display transcriptions"""
@@ -306,11 +697,19 @@ def test_live_transcription():
     
     def audio_chunk_callback(chunk, sample_rate):
         """Callback to process audio chunks"""
-        # Send to transcriber
-        transcriber.add_audio(chunk.flatten())
+        # Send to transcriber (reshape is a view on the contiguous chunk, flatten copies)
+        samples = np.ascontiguousarray(chunk).reshape(-1)
+        transcriber.add_audio(samples)
+        
+        # Redraw the meter at most 10x per second; console writes are slow
+        nonlocal last_meter_ts
+        now = time.monotonic()
+        if now - last_meter_ts < 0.1:
+            return
+        last_meter_ts = now
         
-        # Show volume level
-        rms = np.sqrt(np.mean(chunk**2))
+        # Show volume level (single dot product, no squared temporary)
+        rms = np.sqrt(samples @ samples / samples.size)
         bars = int(rms * 500)
         bars = min(bars, 30)
         sys.stdout.write(f"\r🎤 [{'█' * bars}{'░' * (30-bars)}]")
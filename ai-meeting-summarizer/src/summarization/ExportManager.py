@@ -4,54 +4,249 @@ Exports meeting summaries to various formats (PDF, Markdown, DOCX)
 """
 
 import os
+import hashlib
+import importlib.util
+import threading
+import zipfile
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from html import escape
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from dataclasses import dataclass
+from typing import Optional, Iterable, List
 
 # Prefer markdown2 if available, otherwise fall back to python-markdown or a minimal safe fallback.
+# Converters are built once at import; they keep per-document state, so calls are serialized.
 try:
     import markdown2  # type: ignore
     MARKDOWN2_AVAILABLE = True
     MARKDOWN_AVAILABLE = False
+    _MD_CONVERTER = markdown2.Markdown(extras=['tables', 'fenced-code-blocks'])
 except Exception:
     MARKDOWN2_AVAILABLE = False
     try:
         import markdown as _markdown  # type: ignore
         MARKDOWN_AVAILABLE = True
+        _MD_CONVERTER = _markdown.Markdown(extensions=['tables', 'fenced_code'])
     except Exception:
         MARKDOWN_AVAILABLE = False
+        _MD_CONVERTER = None
+
+_MD_LOCK = threading.Lock()
 
 def convert_markdown_to_html(md_text: str) -> str:
     """
     Convert markdown text to HTML using available libraries or a safe fallback.
     """
-    if MARKDOWN2_AVAILABLE:
-        return markdown2.markdown(md_text, extras=['tables', 'fenced-code-blocks'])
-    if MARKDOWN_AVAILABLE:
-        # Use python-markdown if installed
-        return _markdown.markdown(md_text, extensions=['tables', 'fenced_code'])
+    if _MD_CONVERTER is not None:
+        with _MD_LOCK:
+            if MARKDOWN_AVAILABLE:
+                # python-markdown must be reset between documents
+                _MD_CONVERTER.reset()
+            return str(_MD_CONVERTER.convert(md_text))
     # Minimal safe fallback: escape and wrap in <pre> so content is still viewable
-    import html as _html
-    return f"<pre>{_html.escape(md_text)}</pre>"
-
-# PDF generation
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-
-# DOCX generation
+    return f"<pre>{escape(md_text)}</pre>"
+
+
+# Page wrapper for HTML exports, built once; literal CSS braces are doubled
+_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} - Meeting Summary</title>
+    <style>
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 900px;
+            margin: 0 auto;
+            padding: 40px 20px;
+            background: #f5f5f5;
+        }}
+        .container {{
+            background: white;
+            padding: 40px;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }}
+        h1 {{
+            color: #667eea;
+            border-bottom: 3px solid #667eea;
+            padding-bottom: 10px;
+        }}
+        h2 {{
+            color: #764ba2;
+            margin-top: 30px;
+        }}
+        ul {{
+            padding-left: 25px;
+        }}
+        li {{
+            margin: 10px 0;
+        }}
+        table {{
+            width: 100%;
+            border-collapse: collapse;
+            margin: 20px 0;
+        }}
+        th, td {{
+            padding: 12px;
+            text-align: left;
+            border: 1px solid #ddd;
+        }}
+        th {{
+            background-color: #667eea;
+            color: white;
+            font-weight: bold;
+        }}
+        tr:nth-child(even) {{
+            background-color: #f8f9fa;
+        }}
+        .metadata {{
+            background: #f8f9fa;
+            padding: 15px;
+            border-radius: 5px;
+            margin: 20px 0;
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        {body}
+    </div>
+</body>
+</html>
+"""
+_HTML_HEAD, _HTML_TAIL = _HTML_TEMPLATE.split("{body}")
+
+# Output is staged in this many bytes of buffer before hitting the disk
+_WRITE_BUFFER = 1 << 20
+
+# Optional zstd compression for archive-style batch exports
 try:
-    from docx import Document
-    from docx.shared import Inches, Pt, RGBColor
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-    DOCX_AVAILABLE = True
+    import zstandard
+    ZSTD_AVAILABLE = True
 except ImportError:
-    DOCX_AVAILABLE = False
+    ZSTD_AVAILABLE = False
+
+_ZSTD_LEVEL = 3
+
+
+def write_atomic(filename: Path, chunks: Iterable[str], compress: bool = False) -> Path:
+    """
+    Stream text chunks to a temp file through a large buffer, then rename it
+    into place so readers never see a half-written export.
+    With compress=True the output is zstd-compressed and gets a .zst suffix.
+    Returns the final path.
+    """
+    if compress:
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard not installed. Install with: pip install zstandard")
+        filename = filename.with_name(filename.name + ".zst")
+    
+    tmp = filename.with_name(filename.name + ".tmp")
+    try:
+        if compress:
+            # threads=-1 lets zstd compress frames on every core
+            cctx = zstandard.ZstdCompressor(level=_ZSTD_LEVEL, threads=-1)
+            with open(tmp, 'wb') as raw, cctx.stream_writer(raw) as f:
+                for chunk in chunks:
+                    f.write(chunk.encode('utf-8'))
+        else:
+            with open(tmp, 'w', encoding='utf-8', buffering=_WRITE_BUFFER) as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        os.replace(tmp, filename)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return filename
+
+
+# PDF generation (reportlab is imported on first PDF export)
+# Summaries with more list items than this are drawn by export_pdf_fast
+PDF_FAST_THRESHOLD = 1000
+
+
+@dataclass(slots=True, frozen=True)
+class _EscapedLists:
+    """Markup-escaped copies of a summary's list sections, built once per export"""
+    key_points: List[str]
+    action_items: List[str]
+    decisions: List[str]
+
+
+def _escaped_lists(summary) -> _EscapedLists:
+    """Escape every list item of a summary in one pass per section"""
+    esc = partial(escape, quote=False)
+    return _EscapedLists(
+        key_points=list(map(esc, map(str, summary.key_points))),
+        action_items=list(map(esc, map(str, summary.action_items))),
+        decisions=list(map(esc, map(str, summary.decisions)))
+    )
+
+
+def _bullets(escaped_items: List[str], marker: str) -> str:
+    """
+    Join pre-escaped items into one ReportLab paragraph markup string, so a
+    section costs one markup parse instead of one per item
+    """
+    return "<br/>".join(map(f"{marker} ".__add__, escaped_items))
+
+
+# DOCX generation (python-docx and lxml are imported on first DOCX export)
+DOCX_AVAILABLE = importlib.util.find_spec("docx") is not None
+if not DOCX_AVAILABLE:
     print("⚠️ python-docx not available. Install with: pip install python-docx")
 
+# Summaries with more list items than this are written by export_docx_streaming
+DOCX_STREAMING_THRESHOLD = 1000
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+
+def _w(tag: str) -> str:
+    """Qualified WordprocessingML tag name"""
+    return f"{{{_W_NS}}}{tag}"
+
+
+def _docx_paragraph(text: str = "", style: Optional[str] = None, center: bool = False, color: Optional[str] = None):
+    """Build a standalone <w:p> element with a single run"""
+    from lxml import etree
+    
+    p = etree.Element(_w('p'), nsmap={'w': _W_NS})
+    if style or center:
+        ppr = etree.SubElement(p, _w('pPr'))
+        if style:
+            etree.SubElement(ppr, _w('pStyle'), {_w('val'): style})
+        if center:
+            etree.SubElement(ppr, _w('jc'), {_w('val'): 'center'})
+    if text:
+        r = etree.SubElement(p, _w('r'))
+        if color:
+            rpr = etree.SubElement(r, _w('rPr'))
+            etree.SubElement(rpr, _w('color'), {_w('val'): color})
+        t = etree.SubElement(r, _w('t'), {_XML_SPACE: 'preserve'})
+        t.text = text
+    return p
+
+
+def _docx_table_row(cells):
+    """Build a <w:tr> element with one plain paragraph per cell"""
+    from lxml import etree
+    
+    tr = etree.Element(_w('tr'), nsmap={'w': _W_NS})
+    for text in cells:
+        tc = etree.SubElement(tr, _w('tc'))
+        tc.append(_docx_paragraph(text))
+    return tr
+
 
 class ExportManager:
     """
@@ -61,12 +256,110 @@ class ExportManager:
     def __init__(self, output_dir: Optional[Path] = None):
         self.output_dir = output_dir or Path("outputs/exports")
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Rendered HTML keyed by a hash of its markdown source, so re-exporting
+        # the same summary skips the markdown parser (also persisted on disk)
+        self._md_cache: dict = {}
+        self._md_cache_dir = self.output_dir / ".md_cache"
+        
+        # (package bytes, sectPr) of the default DOCX template, see _docx_template
+        self._docx_template_parts = None
+        
+        # ReportLab styles, built on first PDF export (see _get_pdf_styles)
+        self._pdf_styles = None
+    
+    def _get_pdf_styles(self) -> dict:
+        """Paragraph and table styles for PDF export, built on first use and reused"""
+        if self._pdf_styles is not None:
+            return self._pdf_styles
+        
+        from reportlab.lib import colors
+        from reportlab.lib.enums import TA_CENTER
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import TableStyle
+        
+        styles = getSampleStyleSheet()
+        pdf_styles = {}
+        
+        pdf_styles['title'] = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#667eea'),
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        )
+        
+        pdf_styles['heading'] = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor=colors.HexColor('#764ba2'),
+            spaceAfter=12,
+            spaceBefore=12,
+            fontName='Helvetica-Bold'
+        )
+        
+        normal_style = styles['BodyText']
+        normal_style.fontSize = 11
+        normal_style.leading = 14
+        pdf_styles['normal'] = normal_style
+        
+        pdf_styles['metadata_table'] = TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ])
+        
+        pdf_styles['stats_table'] = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+        ])
+        
+        self._pdf_styles = pdf_styles
+        return pdf_styles
+    
+    def _make_stem(self, meeting_name: str) -> str:
+        """Export filename without extension: meeting name plus timestamp"""
+        return f"{meeting_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    
+    def _markdown_to_html(self, md_content: str) -> str:
+        """Convert markdown to HTML, memoized in memory and on disk"""
+        key = hashlib.blake2b(md_content.encode('utf-8'), digest_size=16).hexdigest()
+        html_content = self._md_cache.get(key)
+        if html_content is not None:
+            return html_content
+        
+        cache_file = self._md_cache_dir / f"{key}.html"
+        if cache_file.exists():
+            html_content = cache_file.read_text(encoding='utf-8')
+        else:
+            html_content = convert_markdown_to_html(md_content)
+            self._md_cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(html_content, encoding='utf-8')
+        
+        self._md_cache[key] = html_content
+        return html_content
     
     def export_pdf(
         self,
         summary,  # MeetingSummary object
         meeting_name: str,
-        page_size=letter
+        page_size=None,
+        stem: Optional[str] = None
     ) -> Path:
         """
         Export summary as PDF with professional formatting
@@ -74,21 +367,30 @@ class ExportManager:
         Args:
             summary: MeetingSummary object
             meeting_name: Name of the meeting
-            page_size: Page size (letter or A4)
+            page_size: Page size (letter or A4; defaults to letter)
+            stem: Filename without extension (defaults to name + current time)
         
         Returns:
             Path to generated PDF file
         """
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+        
+        # Platypus layout dominates on very long summaries; draw those directly
+        n_items = len(summary.key_points) + len(summary.action_items) + len(summary.decisions)
+        if n_items > PDF_FAST_THRESHOLD:
+            return self.export_pdf_fast(summary, meeting_name, page_size, stem)
+        
         print("📄 Generating PDF...")
         
         # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = self.output_dir / f"{meeting_name.replace(' ', '_')}_{timestamp}.pdf"
+        filename = self.output_dir / f"{stem or self._make_stem(meeting_name)}.pdf"
         
         # Create PDF document
         doc = SimpleDocTemplate(
             str(filename),
-            pagesize=page_size,
+            pagesize=page_size or letter,
             rightMargin=72,
             leftMargin=72,
             topMargin=72,
@@ -98,33 +400,14 @@ class ExportManager:
         # Container for the 'Flowable' objects
         elements = []
         
-        # Define styles
-        styles = getSampleStyleSheet()
+        # Styles are built once and reused across exports
+        styles = self._get_pdf_styles()
+        title_style = styles['title']
+        heading_style = styles['heading']
+        normal_style = styles['normal']
         
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#667eea'),
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#764ba2'),
-            spaceAfter=12,
-            spaceBefore=12,
-            fontName='Helvetica-Bold'
-        )
-        
-        normal_style = styles['BodyText']
-        normal_style.fontSize = 11
-        normal_style.leading = 14
+        # List items escaped once for ReportLab's markup parser
+        escaped = _escaped_lists(summary)
         
         # Title
         elements.append(Paragraph(f"🎙️ {meeting_name}", title_style))
@@ -140,16 +423,7 @@ class ExportManager:
             metadata_data.append(['Participants:', ', '.join(summary.participants)])
         
         metadata_table = Table(metadata_data, colWidths=[1.5*inch, 5*inch])
-        metadata_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-        ]))
+        metadata_table.setStyle(styles['metadata_table'])
         
         elements.append(metadata_table)
         elements.append(Spacer(1, 0.3*inch))
@@ -162,22 +436,19 @@ class ExportManager:
         # Key Points
         if summary.key_points:
             elements.append(Paragraph("🔑 Key Points", heading_style))
-            for point in summary.key_points:
-                elements.append(Paragraph(f"• {point}", normal_style))
+            elements.append(Paragraph(_bullets(escaped.key_points, "•"), normal_style))
             elements.append(Spacer(1, 0.2*inch))
         
         # Action Items
         if summary.action_items:
             elements.append(Paragraph("✅ Action Items", heading_style))
-            for item in summary.action_items:
-                elements.append(Paragraph(f"☐ {item}", normal_style))
+            elements.append(Paragraph(_bullets(escaped.action_items, "☐"), normal_style))
             elements.append(Spacer(1, 0.2*inch))
         
         # Decisions
         if summary.decisions:
             elements.append(Paragraph("⚖️ Decisions Made", heading_style))
-            for decision in summary.decisions:
-                elements.append(Paragraph(f"• {decision}", normal_style))
+            elements.append(Paragraph(_bullets(escaped.decisions, "•"), normal_style))
             elements.append(Spacer(1, 0.2*inch))
         
         # Speaker Stats
@@ -189,17 +460,7 @@ class ExportManager:
                 stats_data.append([speaker, f'{percentage:.1f}%'])
             
             stats_table = Table(stats_data, colWidths=[3*inch, 2*inch])
-            stats_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
-            ]))
+            stats_table.setStyle(styles['stats_table'])
             
             elements.append(stats_table)
         
@@ -209,10 +470,95 @@ class ExportManager:
         print(f"✅ PDF exported: {filename}")
         return filename
     
+    def export_pdf_fast(
+        self,
+        summary,  # MeetingSummary object
+        meeting_name: str,
+        page_size=None,
+        stem: Optional[str] = None
+    ) -> Path:
+        """
+        Export summary as a plain PDF drawn directly on a pdfgen Canvas.
+        Skips Platypus layout entirely, so very large summaries render
+        several times faster at the cost of simpler formatting.
+        
+        Args:
+            summary: MeetingSummary object
+            meeting_name: Name of the meeting
+            page_size: Page size (letter or A4; defaults to letter)
+            stem: Filename without extension (defaults to name + current time)
+        
+        Returns:
+            Path to generated PDF file
+        """
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.utils import simpleSplit
+        from reportlab.pdfgen.canvas import Canvas
+        
+        print("📄 Generating PDF (fast)...")
+        
+        # Generate filename
+        filename = self.output_dir / f"{stem or self._make_stem(meeting_name)}.pdf"
+        
+        width, height = page_size or letter
+        margin = 72
+        text_width = width - 2 * margin
+        c = Canvas(str(filename), pagesize=(width, height))
+        y = height - margin
+        
+        def draw(text: str, font: str = 'Helvetica', size: int = 11, gap: float = 0):
+            """Draw wrapped text at the cursor, breaking pages as needed"""
+            nonlocal y
+            leading = size * 1.3
+            y -= gap
+            for line in simpleSplit(text, font, size, text_width) or [""]:
+                if y < margin:
+                    c.showPage()
+                    y = height - margin
+                c.setFont(font, size)
+                c.drawString(margin, y, line)
+                y -= leading
+        
+        # Title and metadata
+        draw(meeting_name, 'Helvetica-Bold', 24)
+        draw(f"Date: {summary.timestamp.strftime('%A, %B %d, %Y at %I:%M %p')}", gap=12)
+        draw(f"Duration: {summary.duration:.1f} minutes")
+        if summary.participants:
+            draw(f"Participants: {', '.join(summary.participants)}")
+        
+        # Summary
+        draw("Summary", 'Helvetica-Bold', 16, gap=18)
+        draw(summary.summary)
+        
+        # Bulleted sections
+        for heading, items, marker in (
+            ("Key Points", summary.key_points, "-"),
+            ("Action Items", summary.action_items, "[ ]"),
+            ("Decisions Made", summary.decisions, "-"),
+        ):
+            if items:
+                draw(heading, 'Helvetica-Bold', 16, gap=18)
+                for item in items:
+                    draw(f"{marker} {item}")
+        
+        # Speaker Stats
+        if summary.speaker_stats:
+            draw("Speaking Time", 'Helvetica-Bold', 16, gap=18)
+            for speaker, percentage in summary.speaker_stats.items():
+                draw(f"{speaker}: {percentage:.1f}%")
+        
+        c.save()
+        
+        print(f"✅ PDF exported: {filename}")
+        return filename
+    
     def export_markdown(
         self,
         summary,  # MeetingSummary object
-        meeting_name: str
+        meeting_name: str,
+        md_content: Optional[str] = None,
+        stem: Optional[str] = None,
+        compress: bool = False
     ) -> Path:
         """
         Export summary as Markdown file
@@ -220,6 +566,9 @@ class ExportManager:
         Args:
             summary: MeetingSummary object
             meeting_name: Name of the meeting
+            md_content: Pre-rendered summary.to_markdown(), if already computed
+            stem: Filename without extension (defaults to name + current time)
+            compress: Write a zstd-compressed .md.zst instead
         
         Returns:
             Path to generated Markdown file
@@ -227,12 +576,12 @@ class ExportManager:
         print("📝 Generating Markdown...")
         
         # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = self.output_dir / f"{meeting_name.replace(' ', '_')}_{timestamp}.md"
+        filename = self.output_dir / f"{stem or self._make_stem(meeting_name)}.md"
         
         # Write markdown content
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(summary.to_markdown())
+        if md_content is None:
+            md_content = summary.to_markdown()
+        filename = write_atomic(filename, [md_content], compress)
         
         print(f"✅ Markdown exported: {filename}")
         return filename
@@ -240,7 +589,8 @@ class ExportManager:
     def export_docx(
         self,
         summary,  # MeetingSummary object
-        meeting_name: str
+        meeting_name: str,
+        stem: Optional[str] = None
     ) -> Optional[Path]:
         """
         Export summary as Word document (DOCX)
@@ -248,6 +598,7 @@ class ExportManager:
         Args:
             summary: MeetingSummary object
             meeting_name: Name of the meeting
+            stem: Filename without extension (defaults to name + current time)
         
         Returns:
             Path to generated DOCX file or None if not available
@@ -256,11 +607,19 @@ class ExportManager:
             print("⚠️ python-docx not available. Cannot export to DOCX.")
             return None
         
+        # Very long summaries are streamed instead of built as one tree
+        n_items = len(summary.key_points) + len(summary.action_items) + len(summary.decisions)
+        if n_items > DOCX_STREAMING_THRESHOLD:
+            return self.export_docx_streaming(summary, meeting_name, stem)
+        
+        from docx import Document
+        from docx.shared import RGBColor
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        
         print("📄 Generating DOCX...")
         
         # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = self.output_dir / f"{meeting_name.replace(' ', '_')}_{timestamp}.docx"
+        filename = self.output_dir / f"{stem or self._make_stem(meeting_name)}.docx"
         
         # Create document
         doc = Document()
@@ -306,31 +665,151 @@ class ExportManager:
         if summary.speaker_stats:
             doc.add_heading('💬 Speaking Time', 1)
             
-            # Create table
-            table = doc.add_table(rows=1, cols=2)
+            # Create the table at full size up front; add_row() per entry
+            # re-walks the table XML each time
+            table = doc.add_table(rows=len(summary.speaker_stats) + 1, cols=2)
             table.style = 'Light Grid Accent 1'
+            rows = table.rows
             
             # Header row
-            header_cells = table.rows[0].cells
+            header_cells = rows[0].cells
             header_cells[0].text = 'Speaker'
             header_cells[1].text = 'Percentage'
             
             # Data rows
-            for speaker, percentage in summary.speaker_stats.items():
-                row_cells = table.add_row().cells
+            for row, (speaker, percentage) in zip(rows[1:], summary.speaker_stats.items()):
+                row_cells = row.cells
                 row_cells[0].text = speaker
                 row_cells[1].text = f'{percentage:.1f}%'
         
         # Save document
         doc.save(str(filename))
-        # Convert markdown to HTML
-        md_content = summary.to_markdown()
-        html_content = convert_markdown_to_html(md_content)
+        
+        print(f"✅ DOCX exported: {filename}")
+        return filename
+    
+    def _docx_template(self):
+        """Default python-docx package bytes and its section properties (built once)"""
+        if self._docx_template_parts is None:
+            from docx import Document
+            from lxml import etree
+            
+            buf = BytesIO()
+            Document().save(buf)
+            with zipfile.ZipFile(buf) as zf:
+                body = etree.fromstring(zf.read('word/document.xml')).find(_w('body'))
+            self._docx_template_parts = (buf.getvalue(), body.find(_w('sectPr')))
+        return self._docx_template_parts
+    
+    def export_docx_streaming(
+        self,
+        summary,  # MeetingSummary object
+        meeting_name: str,
+        stem: Optional[str] = None
+    ) -> Optional[Path]:
+        """
+        Export summary as DOCX, streaming word/document.xml element by element
+        so memory stays flat however long the summary is. Styles and the other
+        package parts are copied from the python-docx default template.
+        
+        Args:
+            summary: MeetingSummary object
+            meeting_name: Name of the meeting
+            stem: Filename without extension (defaults to name + current time)
+        
+        Returns:
+            Path to generated DOCX file or None if not available
+        """
+        if not DOCX_AVAILABLE:
+            print("⚠️ python-docx not available. Cannot export to DOCX.")
+            return None
+        
+        from lxml import etree
+        
+        print("📄 Generating DOCX (streaming)...")
+        
+        # Generate filename
+        filename = self.output_dir / f"{stem or self._make_stem(meeting_name)}.docx"
+        
+        template, sect_pr = self._docx_template()
+        
+        with zipfile.ZipFile(BytesIO(template)) as src, \
+                zipfile.ZipFile(filename, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as dst:
+            # Copy every package part except the body we are about to write
+            for item in src.infolist():
+                if item.filename != 'word/document.xml':
+                    dst.writestr(item.filename, src.read(item.filename))
+            
+            with dst.open('word/document.xml', 'w') as stream, etree.xmlfile(stream, encoding='utf-8') as xf:
+                xf.write_declaration(standalone=True)
+                with xf.element(_w('document'), nsmap={'w': _W_NS}), xf.element(_w('body')):
+                    # Title
+                    xf.write(_docx_paragraph(f'🎙️ {meeting_name}', style='Title', center=True))
+                    
+                    # Metadata
+                    xf.write(_docx_paragraph(f"Date: {summary.timestamp.strftime('%A, %B %d, %Y at %I:%M %p')}"))
+                    xf.write(_docx_paragraph(f"Duration: {summary.duration:.1f} minutes"))
+                    if summary.participants:
+                        xf.write(_docx_paragraph(f"Participants: {', '.join(summary.participants)}"))
+                    xf.write(_docx_paragraph())  # Blank line
+                    
+                    # Summary
+                    xf.write(_docx_paragraph('📋 Summary', style='Heading1'))
+                    xf.write(_docx_paragraph(summary.summary))
+                    
+                    # Key Points
+                    if summary.key_points:
+                        xf.write(_docx_paragraph('🔑 Key Points', style='Heading1'))
+                        for point in summary.key_points:
+                            xf.write(_docx_paragraph(point, style='ListBullet'))
+                            xf.flush()
+                    
+                    # Action Items
+                    if summary.action_items:
+                        xf.write(_docx_paragraph('✅ Action Items', style='Heading1'))
+                        for item in summary.action_items:
+                            xf.write(_docx_paragraph(f'☐ {item}', color='FF8C00'))
+                            xf.flush()
+                    
+                    # Decisions
+                    if summary.decisions:
+                        xf.write(_docx_paragraph('⚖️ Decisions Made', style='Heading1'))
+                        for decision in summary.decisions:
+                            xf.write(_docx_paragraph(decision, style='ListBullet'))
+                            xf.flush()
+                    
+                    # Speaker Stats
+                    if summary.speaker_stats:
+                        xf.write(_docx_paragraph('💬 Speaking Time', style='Heading1'))
+                        with xf.element(_w('tbl')):
+                            tbl_pr = etree.Element(_w('tblPr'), nsmap={'w': _W_NS})
+                            etree.SubElement(tbl_pr, _w('tblStyle'), {_w('val'): 'LightGrid-Accent1'})
+                            etree.SubElement(tbl_pr, _w('tblW'), {_w('w'): '0', _w('type'): 'auto'})
+                            xf.write(tbl_pr)
+                            grid = etree.Element(_w('tblGrid'), nsmap={'w': _W_NS})
+                            etree.SubElement(grid, _w('gridCol'))
+                            etree.SubElement(grid, _w('gridCol'))
+                            xf.write(grid)
+                            
+                            xf.write(_docx_table_row(['Speaker', 'Percentage']))
+                            for speaker, percentage in summary.speaker_stats.items():
+                                xf.write(_docx_table_row([speaker, f'{percentage:.1f}%']))
+                    
+                    # Page setup from the template
+                    if sect_pr is not None:
+                        xf.write(sect_pr)
+        
+        print(f"✅ DOCX exported: {filename}")
+        return filename
     
     def export_html(
         self,
         summary,  # MeetingSummary object
-        meeting_name: str
+        meeting_name: str,
+        md_content: Optional[str] = None,
+        html_content: Optional[str] = None,
+        stem: Optional[str] = None,
+        compress: bool = False
     ) -> Path:
         """
         Export summary as HTML file
@@ -338,6 +817,10 @@ class ExportManager:
         Args:
             summary: MeetingSummary object
             meeting_name: Name of the meeting
+            md_content: Pre-rendered summary.to_markdown(), if already computed
+            html_content: Pre-converted HTML body, if already computed
+            stem: Filename without extension (defaults to name + current time)
+            compress: Write a zstd-compressed .html.zst instead
         
         Returns:
             Path to generated HTML file
@@ -345,89 +828,21 @@ class ExportManager:
         print("🌐 Generating HTML...")
         
         # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = self.output_dir / f"{meeting_name.replace(' ', '_')}_{timestamp}.html"
+        filename = self.output_dir / f"{stem or self._make_stem(meeting_name)}.html"
         
         # Convert markdown to HTML
-        md_content = summary.to_markdown()
-        html_content = markdown2.markdown(md_content, extras=['tables', 'fenced-code-blocks'])
-        
-        # Wrap in HTML template
-        full_html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{meeting_name} - Meeting Summary</title>
-            <style>
-                body {{
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 900px;
-                    margin: 0 auto;
-                    padding: 40px 20px;
-                    background: #f5f5f5;
-                }}
-                .container {{
-                    background: white;
-                    padding: 40px;
-                    border-radius: 10px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }}
-                h1 {{
-                    color: #667eea;
-                    border-bottom: 3px solid #667eea;
-                    padding-bottom: 10px;
-                }}
-                h2 {{
-                    color: #764ba2;
-                    margin-top: 30px;
-                }}
-                ul {{
-                    padding-left: 25px;
-                }}
-                li {{
-                    margin: 10px 0;
-                }}
-                table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin: 20px 0;
-                }}
-                th, td {{
-                    padding: 12px;
-                    text-align: left;
-                    border: 1px solid #ddd;
-                }}
-                th {{
-                    background-color: #667eea;
-                    color: white;
-                    font-weight: bold;
-                }}
-                tr:nth-child(even) {{
-                    background-color: #f8f9fa;
-                }}
-                .metadata {{
-                    background: #f8f9fa;
-                    padding: 15px;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                {html_content}
-            </div>
-        </body>
-        </html>
-        """
-        
-        # Write HTML file
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(full_html)
+        if html_content is None:
+            if md_content is None:
+                md_content = summary.to_markdown()
+            html_content = self._markdown_to_html(md_content)
+        
+        # Wrap in HTML template; head, body and tail are written in turn so the
+        # full page is never assembled as one string
+        filename = write_atomic(filename, [
+            _HTML_HEAD.format(title=escape(meeting_name)),
+            html_content,
+            _HTML_TAIL
+        ], compress)
         
         print(f"✅ HTML exported: {filename}")
         return filename
@@ -435,11 +850,17 @@ class ExportManager:
     def export_all_formats(
         self,
         summary,  # MeetingSummary object
-        meeting_name: str
+        meeting_name: str,
+        compress: bool = False
     ) -> dict:
         """
         Export summary in all available formats
         
+        Args:
+            summary: MeetingSummary object
+            meeting_name: Name of the meeting
+            compress: zstd-compress the Markdown and HTML outputs (for archiving)
+        
         Returns:
             Dictionary with format names as keys and file paths as values
         """
@@ -447,27 +868,32 @@ class ExportManager:
         
         exported_files = {}
         
-        try:
-            exported_files['pdf'] = self.export_pdf(summary, meeting_name)
-        except Exception as e:
-            print(f"⚠️ PDF export failed: {e}")
-        
-        try:
-            exported_files['markdown'] = self.export_markdown(summary, meeting_name)
-        except Exception as e:
-            print(f"⚠️ Markdown export failed: {e}")
-        
-        try:
-            docx_file = self.export_docx(summary, meeting_name)
-            if docx_file:
-                exported_files['docx'] = docx_file
-        except Exception as e:
-            print(f"⚠️ DOCX export failed: {e}")
-        
-        try:
-            exported_files['html'] = self.export_html(summary, meeting_name)
-        except Exception as e:
-            print(f"⚠️ HTML export failed: {e}")
+        # One filename stem for every format, so the files share a timestamp
+        stem = self._make_stem(meeting_name)
+        
+        # Render markdown and HTML once and share them across formats
+        md_content = summary.to_markdown()
+        html_content = self._markdown_to_html(md_content)
+        
+        # The formats are independent, so they render and write concurrently
+        tasks = {
+            'pdf': ("PDF", partial(self.export_pdf, summary, meeting_name, stem=stem)),
+            'markdown': ("Markdown", partial(self.export_markdown, summary, meeting_name, md_content, stem=stem, compress=compress)),
+            'docx': ("DOCX", partial(self.export_docx, summary, meeting_name, stem=stem)),
+            'html': ("HTML", partial(self.export_html, summary, meeting_name, md_content, html_content, stem=stem, compress=compress)),
+        }
+        
+        with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+            futures = {fmt: pool.submit(fn) for fmt, (_, fn) in tasks.items()}
+            
+            # Collect in submission order so the result dict stays stable
+            for fmt, future in futures.items():
+                try:
+                    exported = future.result()
+                    if exported:
+                        exported_files[fmt] = exported
+                except Exception as e:
+                    print(f"⚠️ {tasks[fmt][0]} export failed: {e}")
         
         print(f"\n✅ Exported {len(exported_files)} formats successfully!")
         return exported_files
@@ -4,18 +4,126 @@ Generates intelligent meeting summaries using Groq or HuggingFace models.
 """
 
 import os
+import re
 import json
+import asyncio
+from pathlib import Path
 from dotenv import load_dotenv
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, TYPE_CHECKING
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 
 # ✅ Load environment variables from .env file
 load_dotenv()
 
-# ✅ Import required libraries
-from groq import Groq
-from transformers import pipeline
+# Groq and transformers are imported by the initializer that needs them,
+# so loading one provider never pays for the other
+if TYPE_CHECKING:
+    from groq import Groq
+
+# HuggingFace long-transcript handling: token overlap between consecutive
+# windows and how many windows go through the model per forward pass
+HF_CHUNK_OVERLAP = 64
+HF_BATCH_SIZE = 8
+
+# Fast Groq model for the draft pass of draft-and-verify summarization
+GROQ_DRAFT_MODEL = "llama-3.1-8b-instant"
+
+# Longer Groq transcripts are split into chunks of about this many tokens,
+# summarized concurrently, and the partial summaries reduced in one pass
+GROQ_CHUNK_TOKENS = 2000
+
+# Groq clients shared by every MeetingSummarizer, keyed by API key, so the
+# HTTPS connection pool (and its TLS sessions) is reused across instances
+_GROQ_CLIENTS: Dict[str, "Groq"] = {}
+
+# C-backed JSON parser when available
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Token counts for chunking; without tiktoken they are estimated from words
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+_WORD_RE = re.compile(r"\S+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _count_words(text: str) -> int:
+    """Count whitespace-separated words without building a list of them."""
+    return sum(1 for _ in _WORD_RE.finditer(text))
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """Shared tiktoken encoding (loaded on first use)."""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _count_tokens(text: str) -> int:
+    """Approximate LLM token count of text."""
+    if TIKTOKEN_AVAILABLE:
+        return len(_encoding().encode(text))
+    return -(-_count_words(text) * 4 // 3)  # ~0.75 words per token, rounded up
+
+
+def _split_transcript(transcript: str, max_tokens: int) -> List[str]:
+    """Split on speaker turns (lines), then sentences, into chunks of up to max_tokens."""
+    units = []
+    for line in transcript.splitlines():
+        if _count_tokens(line) <= max_tokens:
+            units.append(line)
+        else:
+            units.extend(_SENTENCE_RE.split(line))
+
+    chunks, current, size = [], [], 0
+    for unit in units:
+        n = _count_tokens(unit)
+        if current and size + n > max_tokens:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(unit)
+        size += n
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+# -------------------- JSON EXTRACTION --------------------
+def _find_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} block in text (single linear scan)."""
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
 
 
 # -------------------- DATA CLASS --------------------
@@ -32,43 +140,48 @@ class MeetingSummary:
     timestamp: datetime
     speaker_stats: Dict[str, float] = None
 
-    def to_markdown(self) -> str:
-        """Convert summary to markdown format."""
-        md = [
-            "# Meeting Summary",
-            f"**Date:** {self.timestamp.strftime('%Y-%m-%d %H:%M')}",
-            f"**Duration:** {self.duration:.1f} minutes\n",
-        ]
+    def iter_markdown(self):
+        """Yield the markdown summary line by line."""
+        yield "# Meeting Summary"
+        yield f"**Date:** {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
+        yield f"**Duration:** {self.duration:.1f} minutes\n"
 
         if self.participants:
-            md.append("## Participants")
-            md.extend([f"- {p}" for p in self.participants])
-            md.append("")
+            yield "## Participants"
+            for p in self.participants:
+                yield f"- {p}"
+            yield ""
 
-        md.append("## Summary")
-        md.append(self.summary)
-        md.append("")
+        yield "## Summary"
+        yield self.summary
+        yield ""
 
         if self.key_points:
-            md.append("## Key Points")
-            md.extend([f"- {kp}" for kp in self.key_points])
-            md.append("")
+            yield "## Key Points"
+            for kp in self.key_points:
+                yield f"- {kp}"
+            yield ""
 
         if self.action_items:
-            md.append("## Action Items")
-            md.extend([f"- [ ] {a}" for a in self.action_items])
-            md.append("")
+            yield "## Action Items"
+            for a in self.action_items:
+                yield f"- [ ] {a}"
+            yield ""
 
         if self.decisions:
-            md.append("## Decisions Made")
-            md.extend([f"- {d}" for d in self.decisions])
-            md.append("")
+            yield "## Decisions Made"
+            for d in self.decisions:
+                yield f"- {d}"
+            yield ""
 
         if self.speaker_stats:
-            md.append("## Speaking Time")
-            md.extend([f"- {s}: {p:.1f}%" for s, p in self.speaker_stats.items()])
+            yield "## Speaking Time"
+            for s, p in self.speaker_stats.items():
+                yield f"- {s}: {p:.1f}%"
 
-        return "\n".join(md)
+    def to_markdown(self) -> str:
+        """Convert summary to markdown format."""
+        return "\n".join(self.iter_markdown())
 
 
 # -------------------- MAIN CLASS --------------------
@@ -83,9 +196,15 @@ class MeetingSummarizer:
         model_name: Optional[str] = None,
         api_key: Optional[str] = None,
         temperature: float = 0.3,
+        quantize: bool = True,
+        draft_model: Optional[str] = None,
     ):
         self.provider = provider.lower()
         self.temperature = temperature
+        self.quantize = quantize  # int8 ONNX weights for the HuggingFace model on CPU
+        # Groq only: a smaller model drafts the summary and the main model
+        # just re-checks the action items (see _draft_and_verify)
+        self.draft_model = draft_model
         self.model_name = model_name
         self.client = None
         self.summarizer = None
@@ -104,7 +223,15 @@ class MeetingSummarizer:
         if not api_key:
             raise ValueError("Missing Groq API key. Set GROQ_API_KEY in your .env file.")
 
-        self.client = Groq(api_key=api_key)
+        self.client = _GROQ_CLIENTS.get(api_key)
+        if self.client is None:
+            import httpx
+            from groq import Groq
+            self.client = Groq(
+                api_key=api_key,
+                http_client=httpx.Client(limits=httpx.Limits(max_keepalive_connections=20)),
+            )
+            _GROQ_CLIENTS[api_key] = self.client
         self.model_name = self.model_name or "llama-3.3-70b-versatile"
         print(f"✅ Groq initialized with model: {self.model_name}")
 
@@ -113,41 +240,110 @@ class MeetingSummarizer:
         self.model_name = self.model_name or "facebook/bart-large-cnn"
         print(f"⏳ Loading HuggingFace model: {self.model_name} ...")
 
-        self.summarizer = pipeline(
-            "summarization",
-            model=self.model_name,
-            device=-1  # CPU
-        )
+        import torch
+        from transformers import pipeline
+
+        # fp16 on GPU halves memory traffic; on CPU try int8 ONNX, else fp32
+        if torch.cuda.is_available():
+            self.summarizer = pipeline(
+                "summarization",
+                model=self.model_name,
+                device=0,
+                torch_dtype=torch.float16,
+            )
+        else:
+            self.summarizer = self._load_int8_pipeline() if self.quantize else None
+            if self.summarizer is None:
+                self.summarizer = pipeline("summarization", model=self.model_name, device=-1)
         print("✅ HuggingFace model loaded successfully!")
 
+    def _load_int8_pipeline(self):
+        """
+        Summarization pipeline over an int8 dynamically quantized ONNX export
+        of the model (built once, cached under models/). None if unavailable.
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            from transformers import AutoTokenizer, pipeline
+        except ImportError:
+            print("⚠️ optimum[onnxruntime] not installed, using fp32 summarizer")
+            return None
+
+        cache_root = Path("models") / self.model_name.replace("/", "--")
+        onnx_dir, int8_dir = cache_root / "onnx", cache_root / "onnx-int8"
+
+        try:
+            tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+
+            if not int8_dir.exists():
+                print("🔄 Exporting and quantizing summarizer to int8 (one-time)...")
+                ORTModelForSeq2SeqLM.from_pretrained(self.model_name, export=True).save_pretrained(onnx_dir)
+                qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+                for onnx_file in sorted(onnx_dir.glob("*.onnx")):
+                    quantizer = ORTQuantizer.from_pretrained(onnx_dir, file_name=onnx_file.name)
+                    quantizer.quantize(save_dir=int8_dir, quantization_config=qconfig)
+                tokenizer.save_pretrained(int8_dir)
+
+            names = {f.name.replace("_quantized", ""): f.name for f in int8_dir.glob("*_quantized.onnx")}
+            model = ORTModelForSeq2SeqLM.from_pretrained(
+                int8_dir,
+                encoder_file_name=names["encoder_model.onnx"],
+                decoder_file_name=names.get("decoder_model_merged.onnx", names.get("decoder_model.onnx")),
+                decoder_with_past_file_name=names.get("decoder_with_past_model.onnx"),
+            )
+            return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+        except Exception as e:
+            print(f"⚠️ int8 summarizer unavailable ({e}), using fp32")
+            return None
+
     # -------------------- SUMMARIZATION --------------------
     def summarize(self, transcript: str, style: str = "detailed") -> MeetingSummary:
         """Generate meeting summary."""
         print("\n🧠 Generating meeting summary...")
 
         if self.provider == "groq":
-            summary_data = self._summarize_with_groq(transcript, style)
+            chunks = _split_transcript(transcript, GROQ_CHUNK_TOKENS)
+            if len(chunks) > 1:
+                summary_data = self._map_reduce_groq(chunks, style)
+            else:
+                summary_data = self._summarize_with_groq(transcript, style)
         else:
             summary_data = self._summarize_with_huggingface(transcript)
 
-        meeting_summary = MeetingSummary(
+        meeting_summary = self._build_summary(transcript, summary_data)
+
+        print("✅ Summary generated successfully!")
+        return meeting_summary
+
+    def summarize_many(self, transcripts: List[str], style: str = "detailed") -> List[MeetingSummary]:
+        """Summarize several transcripts; Groq requests are sent concurrently."""
+        if self.provider != "groq":
+            return [self.summarize(t, style) for t in transcripts]
+
+        print(f"\n🧠 Generating {len(transcripts)} meeting summaries...")
+        results = asyncio.run(self._gather(transcripts, style))
+        print("✅ Summaries generated successfully!")
+        return [self._build_summary(t, data) for t, data in zip(transcripts, results)]
+
+    def _build_summary(self, transcript: str, summary_data: Dict) -> MeetingSummary:
+        """Wrap parsed model output in a MeetingSummary."""
+        return MeetingSummary(
             raw_transcript=transcript,
             summary=summary_data.get("summary", ""),
             key_points=summary_data.get("key_points", []),
             action_items=summary_data.get("action_items", []),
             decisions=summary_data.get("decisions", []),
             participants=[],
-            duration=len(transcript.split()) / 150,  # rough minutes estimate
+            duration=_count_words(transcript) / 150,  # rough minutes estimate
             timestamp=datetime.now(),
             speaker_stats={},
         )
 
-        print("✅ Summary generated successfully!")
-        return meeting_summary
-
     # -------------------- GROQ --------------------
-    def _summarize_with_groq(self, transcript: str, style: str) -> Dict:
-        """Summarize using Groq API."""
+    def _groq_request(self, transcript: str, style: str, model: Optional[str] = None) -> Dict:
+        """Chat completion arguments for one transcript."""
         prompt = f"""
         Summarize the following meeting in detail:
 
@@ -157,35 +353,175 @@ class MeetingSummarizer:
         summary, key_points, action_items, decisions.
         """
 
+        return dict(
+            model=model or self.model_name,
+            messages=[
+                {"role": "system", "content": "You are an expert meeting summarizer."},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=self.temperature,
+            max_tokens=2000,
+        )
+
+    def _groq_verify_request(self, transcript: str, action_items: List[str]) -> Dict:
+        """Chat completion arguments for checking drafted action items."""
+        prompt = f"""
+        Below is a meeting transcript and a draft list of its action items.
+        Correct the list: drop items that were not actually agreed, fix
+        owners and deadlines, and add any that are missing.
+
+        Transcript:
+        {transcript}
+
+        Draft action items:
+        {json.dumps(action_items)}
+
+        Return JSON with a single key: action_items.
+        """
+
+        return dict(
+            model=self.model_name,
+            messages=[
+                {"role": "system", "content": "You are an expert meeting summarizer."},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=self.temperature,
+            max_tokens=500,
+        )
+
+    def _apply_verified(self, draft: Dict, content: str) -> Dict:
+        """Replace the draft's action items with the verified list, if one parsed."""
+        verified = self._parse_summary_response(content).get("action_items")
+        if isinstance(verified, list):
+            draft["action_items"] = verified
+        return draft
+
+    def _groq_error(self, e: Exception) -> Dict:
+        """Placeholder summary returned when a Groq call fails."""
+        print(f"❌ Groq error: {e}")
+        return {
+            "summary": f"Error generating summary: {str(e)}",
+            "key_points": [],
+            "action_items": [],
+            "decisions": [],
+        }
+
+    def _summarize_with_groq(self, transcript: str, style: str) -> Dict:
+        """Summarize using Groq API."""
+        try:
+            if self.draft_model:
+                return self._draft_and_verify(transcript, style)
+
+            response = self.client.chat.completions.create(**self._groq_request(transcript, style))
+            content = response.choices[0].message.content
+            return self._parse_summary_response(content)
+
+        except Exception as e:
+            return self._groq_error(e)
+
+    def _draft_and_verify(self, transcript: str, style: str) -> Dict:
+        """Draft the whole summary with the fast model; the main model only re-checks action items."""
+        response = self.client.chat.completions.create(
+            **self._groq_request(transcript, style, model=self.draft_model)
+        )
+        draft = self._parse_summary_response(response.choices[0].message.content)
+
         try:
             response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "You are an expert meeting summarizer."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=self.temperature,
-                max_tokens=2000,
+                **self._groq_verify_request(transcript, draft.get("action_items", []))
             )
+            return self._apply_verified(draft, response.choices[0].message.content)
+        except Exception as e:
+            print(f"⚠️ Action item check failed, keeping the draft: {e}")
+            return draft
 
+    async def _summarize_async(self, client, transcript: str, style: str) -> Dict:
+        """Summarize one transcript with the async Groq client."""
+        try:
+            if self.draft_model:
+                return await self._draft_and_verify_async(client, transcript, style)
+
+            response = await client.chat.completions.create(**self._groq_request(transcript, style))
             content = response.choices[0].message.content
             return self._parse_summary_response(content)
 
         except Exception as e:
-            print(f"❌ Groq error: {e}")
-            return {
-                "summary": f"Error generating summary: {str(e)}",
-                "key_points": [],
-                "action_items": [],
-                "decisions": [],
-            }
+            return self._groq_error(e)
+
+    async def _draft_and_verify_async(self, client, transcript: str, style: str) -> Dict:
+        """Async counterpart of _draft_and_verify."""
+        response = await client.chat.completions.create(
+            **self._groq_request(transcript, style, model=self.draft_model)
+        )
+        draft = self._parse_summary_response(response.choices[0].message.content)
+
+        try:
+            response = await client.chat.completions.create(
+                **self._groq_verify_request(transcript, draft.get("action_items", []))
+            )
+            return self._apply_verified(draft, response.choices[0].message.content)
+        except Exception as e:
+            print(f"⚠️ Action item check failed, keeping the draft: {e}")
+            return draft
+
+    async def _gather(self, transcripts: List[str], style: str) -> List[Dict]:
+        """Issue all Groq requests at once and wait for every result."""
+        from groq import AsyncGroq
+
+        # The async client is bound to this event loop, so it lives per call
+        async with AsyncGroq(api_key=self.client.api_key) as client:
+            return await asyncio.gather(
+                *(self._summarize_async(client, t, style) for t in transcripts)
+            )
+
+    def _map_reduce_groq(self, chunks: List[str], style: str) -> Dict:
+        """Summarize transcript chunks concurrently, then merge them in one pass."""
+        print(f"🧩 Summarizing {len(chunks)} transcript chunks...")
+        partials = asyncio.run(self._gather(chunks, style))
+
+        notes = []
+        for i, part in enumerate(partials, 1):
+            notes.append(f"Part {i}: {part.get('summary', '')}")
+            for key in ("key_points", "action_items", "decisions"):
+                items = part.get(key) or []
+                if items:
+                    notes.append(f"{key.replace('_', ' ').title()}: " + "; ".join(map(str, items)))
+
+        return self._summarize_with_groq("\n".join(notes), style)
 
     # -------------------- HUGGINGFACE --------------------
     def _summarize_with_huggingface(self, transcript: str) -> Dict:
         """Summarize using HuggingFace pipeline."""
         try:
-            result = self.summarizer(transcript[:4000], max_length=200, min_length=50, do_sample=False)
-            combined_summary = result[0]["summary_text"]
+            gen_kwargs = dict(max_length=200, min_length=50, do_sample=False, truncation=True)
+
+            # Split the whole transcript into overlapping token windows that
+            # fit the model, and summarize them as one batch
+            tokenizer = self.summarizer.tokenizer
+            window = self.summarizer.model.config.max_position_embeddings - 32
+            step = window - HF_CHUNK_OVERLAP
+
+            def summarize_windows(text: str) -> List[str]:
+                ids = tokenizer(text, add_special_tokens=False)["input_ids"]
+                chunks = [
+                    tokenizer.decode(ids[i:i + window], skip_special_tokens=True)
+                    for i in range(0, max(len(ids) - HF_CHUNK_OVERLAP, 1), step)
+                ]
+                results = self.summarizer(chunks, batch_size=HF_BATCH_SIZE, **gen_kwargs)
+                return [r["summary_text"] for r in results]
+
+            partials = summarize_windows(transcript)
+
+            # Hierarchical reduce: re-window the joined chunk summaries until
+            # they fit one window, so no part of a long meeting is truncated
+            while len(partials) > 1:
+                reduced = summarize_windows(" ".join(partials))
+                if len(reduced) >= len(partials):
+                    # No shrinkage (summaries as long as the window); stop
+                    # rather than loop, keeping every partial
+                    break
+                partials = reduced
+            combined_summary = " ".join(partials)
 
             return {
                 "summary": combined_summary,
@@ -206,10 +542,13 @@ class MeetingSummarizer:
     def _parse_summary_response(self, text: str) -> Dict:
         """Try to parse model output as JSON."""
         try:
-            import re
-            json_match = re.search(r"\{.*\}", text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
+            json_text = _find_json_object(text)
+            if json_text:
+                try:
+                    return json_loads(json_text)
+                except ValueError:
+                    # orjson is strict (no NaN/Infinity); give stdlib json a try
+                    return json.loads(json_text)
         except Exception as e:
             print(f"⚠️ JSON parse error: {e}")
 
@@ -3,30 +3,156 @@ AI Meeting Summarizer - Minimal Working Version
 """
 
 import streamlit as st
-import numpy as np
+import gc
+import logging
 import time
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import sys
 
+# Library modules (e.g. the email sender) report progress via logging
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 # Add src directory to path
 current_dir = Path(__file__).parent
 src_dir = current_dir.parent
 sys.path.insert(0, str(src_dir))
 
-# Import modules (with error handling)
+# Import modules (with error handling). Model-backed modules (STT, diarization,
+# summarization) pull in torch/CTranslate2 and are imported where they are
+# first used, so the page renders without loading them
 try:
     from audio.audio_capture import AudioRecorder
-    from stt.realtime_stt import RealTimeTranscriber, TranscriptionSegment
-    from diarization.speaker_identifier import SpeakerDiarizer
-    from summarization.summarizer import MeetingSummarizer
-    from summarization.ExportManager import ExportManager
-    from utils.email_sender import EmailSender
+    from utils.config import get_config
     IMPORTS_OK = True
 except Exception as e:
     st.error(f"Import Error: {e}")
     IMPORTS_OK = False
 
+# Refresh interval for the live widgets while recording (seconds)
+LIVE_REFRESH_SECONDS = 1.0
+
+# Segments kept in memory for the live transcript; the full transcript is
+# appended to a JSONL log on disk
+LIVE_TRANSCRIPT_SEGMENTS = 10
+
+# How often the processing panel polls the background pipeline (seconds)
+PROCESSING_POLL_SECONDS = 0.5
+
+
+# Cached model/service factories: heavy weights are loaded once per
+# process and argument combination instead of on every button press
+# At most two speech models stay resident, so switching sizes back and
+# forth is instant but old weights don't pile up in (V)RAM
+@st.cache_resource(max_entries=2, show_spinner="Loading speech model...")
+def get_transcriber(model_type: str, model_size: str, language: str):
+    from stt.realtime_stt import RealTimeTranscriber
+    return RealTimeTranscriber(
+        model_type=model_type,
+        model_size=model_size,
+        language=language
+    )
+
+
+@st.cache_resource(show_spinner="Loading diarization model...")
+def get_diarizer(use_pyannote: bool = True):
+    from diarization.speaker_identifier import SpeakerDiarizer
+    return SpeakerDiarizer(
+        use_pyannote=use_pyannote,
+        max_speakers=get_config().diarization.max_speakers
+    )
+
+
+@st.cache_resource
+def get_summarizer(provider: str = "groq"):
+    from summarization.summarizer import MeetingSummarizer, GROQ_DRAFT_MODEL
+    # Groq: 8B drafts the summary, the 70B model only re-checks action items
+    draft_model = GROQ_DRAFT_MODEL if provider == "groq" else None
+    return MeetingSummarizer(provider=provider, draft_model=draft_model)
+
+
+@st.cache_resource
+def get_export_manager():
+    from summarization.ExportManager import ExportManager
+    return ExportManager()
+
+
+@st.cache_resource
+def _email_sender_handle() -> list:
+    """Process-wide handle on the cached EmailSender (empty until one is built)"""
+    return []
+
+
+@st.cache_resource
+def get_email_sender():
+    from utils.email_sender import EmailSender
+    sender = EmailSender()
+    _email_sender_handle().append(sender)
+    return sender
+
+
+def clear_model_cache():
+    """Drop all cached models and return freed GPU memory to the driver"""
+    # The email sender is cached too: stop its queue worker and SMTP session
+    # first so no orphaned worker keeps draining the queue database. Only an
+    # existing sender is closed, without waiting on an in-flight send
+    for sender in _email_sender_handle():
+        sender.close(wait=False)
+    st.cache_resource.clear()
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+def run_pipeline(audio_file, transcript_log, transcript_text, live_diarizer, summarizer, meeting_type, progress):
+    """
+    Diarize and summarize a finished recording. Runs on the background
+    executor; stage updates are pushed to `progress` as (percent, text).
+    `transcript_text` is the plain transcript the transcriber assembled
+    while recording; the segment log is only read back for diarization.
+    """
+    from stt.realtime_stt import TranscriptLog
+    
+    # Diarization (most windows were already processed during recording)
+    if live_diarizer and audio_file:
+        progress.put((33, "👥 Identifying speakers..."))
+        diarizer = live_diarizer.diarizer
+        speaker_segments = live_diarizer.stop()
+        diarized_segments = diarizer.merge_with_transcript(
+            speaker_segments,
+            TranscriptLog.load(transcript_log) if transcript_log else []
+        )
+    else:
+        diarized_segments = []
+    
+    # Summarization
+    progress.put((66, "🧠 Generating summary..."))
+    
+    # Get full text
+    if diarized_segments:
+        full_text = "\n".join(f"{s.speaker_id}: {s.text}" for s in diarized_segments)
+    else:
+        full_text = transcript_text
+    
+    # Generate summary
+    summary = summarizer.summarize(full_text, style=meeting_type.lower())
+    
+    progress.put((100, "✅ Complete!"))
+    return summary
+
+
+def build_pdf(export_manager, summary, meeting_name):
+    """Render the PDF export (on the export executor); returns (file name, bytes)"""
+    pdf_path = Path(export_manager.export_pdf(summary, meeting_name))
+    return pdf_path.name, pdf_path.read_bytes()
+
 # Page config
 st.set_page_config(
     page_title="AI Meeting Summarizer",
@@ -38,16 +164,44 @@ st.set_page_config(
 # Initialize session state
 if 'recording' not in st.session_state:
     st.session_state.recording = False
-if 'transcript_segments' not in st.session_state:
-    st.session_state.transcript_segments = []
+if 'visible_segments' not in st.session_state:
+    st.session_state.visible_segments = deque(maxlen=LIVE_TRANSCRIPT_SEGMENTS)
+if 'segment_count' not in st.session_state:
+    st.session_state.segment_count = 0
+if 'transcript_log' not in st.session_state:
+    st.session_state.transcript_log = None
+if 'total_words' not in st.session_state:
+    st.session_state.total_words = 0
+if 'live_stats' not in st.session_state:
+    st.session_state.live_stats = {"words": 0, "segments": 0}
 if 'meeting_start_time' not in st.session_state:
     st.session_state.meeting_start_time = None
+if 'meeting_start_mono' not in st.session_state:
+    st.session_state.meeting_start_mono = None
 if 'audio_file' not in st.session_state:
     st.session_state.audio_file = None
 if 'summary' not in st.session_state:
     st.session_state.summary = None
+if 'summary_md' not in st.session_state:
+    st.session_state.summary_md = None
 if 'processing' not in st.session_state:
     st.session_state.processing = False
+if 'executor' not in st.session_state:
+    st.session_state.executor = ThreadPoolExecutor(max_workers=1)
+if 'pipeline_future' not in st.session_state:
+    st.session_state.pipeline_future = None
+if 'export_executor' not in st.session_state:
+    st.session_state.export_executor = ThreadPoolExecutor(max_workers=1)
+if 'pdf_future' not in st.session_state:
+    st.session_state.pdf_future = None
+if 'pipeline_progress' not in st.session_state:
+    st.session_state.pipeline_progress = queue.Queue()
+if 'pipeline_stage' not in st.session_state:
+    st.session_state.pipeline_stage = (0, "")
+if 'processing_error' not in st.session_state:
+    st.session_state.processing_error = None
+if 'live_diarizer' not in st.session_state:
+    st.session_state.live_diarizer = None
 
 # Sidebar
 with st.sidebar:
@@ -59,12 +213,17 @@ with st.sidebar:
     
     st.markdown("---")
     st.subheader("🎤 STT Settings")
-    stt_model = st.selectbox("Model", ["Whisper (Accurate)", "Vosk (Fast)"])
-    whisper_size = st.selectbox("Whisper Size", ["tiny", "base", "small"])
+    stt_model = st.selectbox("Model", ["Whisper (Fast INT8)", "Vosk (Fast)"])
+    whisper_size = st.selectbox("Whisper Size", ["tiny", "base", "small", "distil-v3"])
     
     st.markdown("---")
     enable_diarization = st.checkbox("Enable Speaker ID", value=True)
-    email_recipient = st.text_input("Email To", placeholder="email@example.com")
+    email_recipient = st.text_input("Email To", placeholder="email@example.com, ...")
+    
+    st.markdown("---")
+    if st.button("🧹 Clear models", disabled=st.session_state.recording or st.session_state.processing):
+        clear_model_cache()
+        st.success("✅ Model cache cleared")
 
 # Header
 st.title("🎙️ AI Meeting Summarizer")
@@ -89,19 +248,48 @@ with col1:
             
             # Initialize transcriber
             model_type = "whisper" if "Whisper" in stt_model else "vosk"
-            st.session_state.transcriber = RealTimeTranscriber(
-                model_type=model_type,
-                model_size=whisper_size,
-                language="en"
+            st.session_state.transcriber = get_transcriber(model_type, whisper_size, "en")
+            
+            from stt.realtime_stt import TranscriptLog
+            from diarization.speaker_identifier import StreamingDiarizer
+            
+            # Diarize rolling windows while recording
+            if enable_diarization:
+                live_diarizer = StreamingDiarizer(get_diarizer(use_pyannote=True), sample_rate=16000)
+                live_diarizer.start()
+            else:
+                live_diarizer = None
+            st.session_state.live_diarizer = live_diarizer
+            
+            # Live view keeps the last few segments; everything goes to the log
+            visible_segments = deque(maxlen=LIVE_TRANSCRIPT_SEGMENTS)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            transcript_log = TranscriptLog(
+                get_config().paths.transcripts_dir / f"{meeting_name.replace(' ', '_')}_{timestamp}.jsonl"
             )
+            st.session_state.visible_segments = visible_segments
+            st.session_state.transcript_log = transcript_log
+            st.session_state.segment_count = 0
+            
+            # Counters updated by the transcriber thread, which has no script
+            # context (st.session_state is unusable there); the live fragment
+            # copies them into session_state
+            live_stats = {"words": 0, "segments": 0}
+            st.session_state.live_stats = live_stats
             
             # Callbacks
             def transcription_callback(segment):
                 if segment.is_final:
-                    st.session_state.transcript_segments.append(segment)
+                    visible_segments.append(segment)
+                    transcript_log.append(segment)
+                    live_stats["segments"] += 1
+                    live_stats["words"] += len(segment.text.split())
             
             def audio_callback(chunk, sample_rate):
-                st.session_state.transcriber.add_audio(chunk.flatten())
+                # The recorder hands over a fresh contiguous copy, so this is a view
+                st.session_state.transcriber.add_audio(chunk.reshape(-1))
+                if live_diarizer:
+                    live_diarizer.add_audio(chunk)
             
             # Start
             st.session_state.transcriber.start_realtime_transcription(callback=transcription_callback)
@@ -109,7 +297,8 @@ with col1:
             
             st.session_state.recording = True
             st.session_state.meeting_start_time = datetime.now()
-            st.session_state.transcript_segments = []
+            st.session_state.meeting_start_mono = time.monotonic()
+            st.session_state.total_words = 0
             
             st.success("🎙️ Recording started!")
             st.rerun()
@@ -123,10 +312,26 @@ with col2:
             # Stop recording
             audio_file = st.session_state.recorder.stop_recording()
             st.session_state.transcriber.stop_transcription()
+            st.session_state.transcript_log.close()
             
             st.session_state.recording = False
             st.session_state.audio_file = audio_file
             st.session_state.processing = True
+            st.session_state.processing_error = None
+            st.session_state.pipeline_stage = (0, "")
+            
+            # Hand diarization + summarization to the background worker so
+            # the script thread stays responsive while it runs
+            st.session_state.pipeline_future = st.session_state.executor.submit(
+                run_pipeline,
+                audio_file,
+                st.session_state.transcript_log.path,
+                st.session_state.transcriber.get_full_text(),
+                st.session_state.live_diarizer,
+                get_summarizer("groq"),
+                meeting_type,
+                st.session_state.pipeline_progress
+            )
             
             st.success("⏹️ Recording stopped!")
             st.rerun()
@@ -134,99 +339,108 @@ with col2:
         except Exception as e:
             st.error(f"❌ Error stopping: {e}")
 
-with col3:
-    if st.session_state.recording and st.session_state.meeting_start_time:
-        duration = int((datetime.now() - st.session_state.meeting_start_time).total_seconds())
+# While recording, only the fragments below tick; the rest of the script
+# (imports, sidebar, summary) is not re-executed every second
+live_refresh = LIVE_REFRESH_SECONDS if st.session_state.recording else None
+
+
+@st.fragment(run_every=live_refresh)
+def recording_status():
+    """Recording indicator with elapsed time"""
+    if st.session_state.recording and st.session_state.meeting_start_mono is not None:
+        duration = int(time.monotonic() - st.session_state.meeting_start_mono)
         st.info(f"🔴 RECORDING - {duration // 60:02d}:{duration % 60:02d}")
     else:
         st.info("⚪ NOT RECORDING")
 
-# Auto-refresh during recording
-if st.session_state.recording:
-    time.sleep(1)
-    st.rerun()
 
-# Metrics
-if len(st.session_state.transcript_segments) > 0:
+@st.fragment(run_every=live_refresh)
+def live_transcript():
+    """Metrics and the most recent transcript segments"""
+    st.session_state.total_words = st.session_state.live_stats["words"]
+    st.session_state.segment_count = st.session_state.live_stats["segments"]
+    
+    # Metrics
+    if st.session_state.segment_count > 0:
+        st.markdown("---")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Segments", st.session_state.segment_count)
+        with col2:
+            duration = int(time.monotonic() - st.session_state.meeting_start_mono) if st.session_state.meeting_start_mono is not None else 0
+            st.metric("Duration", f"{duration // 60}m {duration % 60}s")
+        with col3:
+            st.metric("Words", st.session_state.total_words)
+    
+    # Live Transcript
     st.markdown("---")
-    col1, col2, col3 = st.columns(3)
+    st.subheader("💬 Live Transcript")
     
-    with col1:
-        st.metric("Segments", len(st.session_state.transcript_segments))
-    with col2:
-        duration = int((datetime.now() - st.session_state.meeting_start_time).total_seconds()) if st.session_state.meeting_start_time else 0
-        st.metric("Duration", f"{duration // 60}m {duration % 60}s")
-    with col3:
-        words = sum([len(seg.text.split()) for seg in st.session_state.transcript_segments])
-        st.metric("Words", words)
+    if st.session_state.visible_segments:
+        with st.container():
+            # A fixed set of slots keeps the element tree identical between
+            # ticks, so the frontend updates bubbles in place instead of
+            # rebuilding them; unused slots render nothing
+            slots = [st.empty() for _ in range(LIVE_TRANSCRIPT_SEGMENTS)]
+            # Snapshot: the transcription thread may append while we render
+            for slot, segment in zip(slots, list(st.session_state.visible_segments)):
+                with slot.chat_message("assistant"):
+                    st.write(segment.text)
+    else:
+        st.info("👆 Start recording to see live transcription")
 
-# Live Transcript
-st.markdown("---")
-st.subheader("💬 Live Transcript")
 
-if len(st.session_state.transcript_segments) > 0:
-    with st.container():
-        for segment in st.session_state.transcript_segments[-10:]:  # Last 10 segments
-            with st.chat_message("assistant"):
-                st.write(segment.text)
-else:
-    st.info("👆 Start recording to see live transcription")
+with col3:
+    recording_status()
+
+live_transcript()
 
 # Processing
-if st.session_state.processing and not st.session_state.recording:
-    st.markdown("---")
-    st.subheader("🔄 Processing...")
+@st.fragment(run_every=PROCESSING_POLL_SECONDS)
+def processing_status():
+    """Poll the background pipeline and show its current stage"""
+    progress = st.session_state.pipeline_progress
+    while True:
+        try:
+            st.session_state.pipeline_stage = progress.get_nowait()
+        except queue.Empty:
+            break
     
-    progress_bar = st.progress(0)
-    status = st.empty()
+    percent, text = st.session_state.pipeline_stage
+    st.progress(percent)
+    st.text(text)
     
-    try:
-        # Diarization
-        if enable_diarization and st.session_state.audio_file:
-            status.text("👥 Identifying speakers...")
-            progress_bar.progress(33)
-            
-            diarizer = SpeakerDiarizer(use_pyannote=True)
-            speaker_segments = diarizer.diarize_audio(st.session_state.audio_file)
-            diarized_segments = diarizer.merge_with_transcript(
-                speaker_segments,
-                st.session_state.transcript_segments
-            )
-        else:
-            diarized_segments = []
-        
-        # Summarization
-        status.text("🧠 Generating summary...")
-        progress_bar.progress(66)
-        
-        # Get full text
-        if diarized_segments:
-            full_text = "\n".join([f"{s.speaker_id}: {s.text}" for s in diarized_segments])
-        else:
-            full_text = " ".join([s.text for s in st.session_state.transcript_segments])
-        
-        # Generate summary
-        summarizer = MeetingSummarizer(provider="groq")
-        st.session_state.summary = summarizer.summarize(full_text, style=meeting_type.lower())
-        
-        progress_bar.progress(100)
-        status.text("✅ Complete!")
-        time.sleep(1)
+    future = st.session_state.pipeline_future
+    if future is None or future.done():
+        try:
+            if future is not None:
+                st.session_state.summary = future.result()
+                st.session_state.summary_md = st.session_state.summary.to_markdown()
+                st.session_state.pdf_future = None
+        except Exception as e:
+            st.session_state.processing_error = str(e)
         
+        st.session_state.pipeline_future = None
         st.session_state.processing = False
         st.rerun()
-        
-    except Exception as e:
-        st.error(f"❌ Processing error: {e}")
-        st.session_state.processing = False
+
+
+if st.session_state.processing and not st.session_state.recording:
+    st.markdown("---")
+    st.subheader("🔄 Processing...")
+    processing_status()
+
+if st.session_state.processing_error:
+    st.error(f"❌ Processing error: {st.session_state.processing_error}")
 
 # Summary Display
 if st.session_state.summary:
     st.markdown("---")
     st.subheader("🤖 AI Summary")
     
-    # Display summary
-    summary_md = st.session_state.summary.to_markdown()
+    # Display summary (rendered once when the summary arrived)
+    summary_md = st.session_state.summary_md
     st.markdown(summary_md)
     
     # Export buttons
@@ -235,20 +449,51 @@ if st.session_state.summary:
     
     col1, col2, col3 = st.columns(3)
     
-    with col1:
-        if st.button("📄 PDF", use_container_width=True):
+    # PDF renders on the export executor; poll only while it is running
+    pdf_future = st.session_state.pdf_future
+    pdf_refresh = PROCESSING_POLL_SECONDS if pdf_future is not None and not pdf_future.done() else None
+    
+    @st.fragment(run_every=pdf_refresh)
+    def pdf_export():
+        """PDF button, then a progress placeholder, then the download"""
+        future = st.session_state.pdf_future
+        if future is None:
+            if st.button("📄 PDF", use_container_width=True):
+                st.session_state.pdf_future = st.session_state.export_executor.submit(
+                    build_pdf,
+                    get_export_manager(),
+                    st.session_state.summary,
+                    meeting_name
+                )
+                st.rerun()
+        elif not future.done():
+            st.button("⏳ Generating PDF...", disabled=True, use_container_width=True)
+        elif pdf_refresh:
+            # Finished since the last full run: rerun once to stop polling
+            st.rerun()
+        else:
             try:
-                export_manager = ExportManager()
-                pdf_path = export_manager.export_pdf(st.session_state.summary, meeting_name)
-                st.success(f"✅ PDF: {pdf_path}")
+                file_name, pdf_bytes = future.result()
+                st.download_button(
+                    label="📄 Download PDF",
+                    data=pdf_bytes,
+                    file_name=file_name,
+                    mime="application/pdf",
+                    use_container_width=True
+                )
             except Exception as e:
                 st.error(f"❌ Error: {e}")
+                if st.button("🔁 Retry PDF", use_container_width=True):
+                    st.session_state.pdf_future = None
+                    st.rerun()
+    
+    with col1:
+        pdf_export()
     
     with col2:
-        md_content = st.session_state.summary.to_markdown()
         st.download_button(
             label="📝 Markdown",
-            data=md_content,
+            data=summary_md,
             file_name=f"{meeting_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
             mime="text/markdown",
             use_container_width=True
@@ -258,9 +503,24 @@ if st.session_state.summary:
         if st.button("📧 Email", disabled=not email_recipient, use_container_width=True):
             if email_recipient:
                 try:
-                    email_sender = EmailSender()
-                    email_sender.send_summary(email_recipient, st.session_state.summary, meeting_name)
-                    st.success(f"✅ Sent to {email_recipient}")
+                    email_sender = get_email_sender()
+                    recipients = [e.strip() for e in email_recipient.split(",") if e.strip()]
+                    if len(recipients) > 1:
+                        results = email_sender.send_summary_bulk(
+                            recipients, st.session_state.summary, meeting_name
+                        )
+                        sent = [e for e, ok in results.items() if ok]
+                        failed = [e for e, ok in results.items() if not ok]
+                        if sent:
+                            st.success(f"✅ Sent to {', '.join(sent)}")
+                        if not sent:
+                            st.error("❌ Email failed for all recipients (check EMAIL_ADDRESS / EMAIL_PASSWORD)")
+                        elif failed:
+                            st.warning(f"⚠️ Not delivered to {', '.join(failed)}")
+                    elif email_sender.enqueue_summary(recipients[0], st.session_state.summary, meeting_name):
+                        st.success(f"📬 Queued for {recipients[0]}")
+                    else:
+                        st.error("❌ Could not queue email (check EMAIL_ADDRESS / EMAIL_PASSWORD)")
                 except Exception as e:
                     st.error(f"❌ Error: {e}")
 
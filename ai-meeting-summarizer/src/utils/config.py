@@ -4,9 +4,9 @@ Loads settings from .env file and provides easy access
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
-from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -16,12 +16,46 @@ load_dotenv()
 PROJECT_ROOT = Path(__file__).parent.parent
 
 
-@dataclass
-class APIConfig:
+def _flag(value: str) -> bool:
+    """Parse a "true"/"false" environment flag"""
+    return value.lower() == "true"
+
+
+def _project_path(value: str) -> Path:
+    """Resolve a directory setting relative to the project root"""
+    return PROJECT_ROOT / value
+
+
+class _Section:
+    """
+    Base for config sections. Each subclass lists its settings in _FIELDS as
+    attribute -> (env var, default, parser); values are read from the
+    environment on construction unless passed as keyword arguments.
+    """
+    
+    __slots__ = ()
+    _FIELDS: Dict[str, Tuple[str, str, Callable[[str], Any]]] = {}
+    
+    def __init__(self, **values):
+        for name, (env_var, default, parse) in self._FIELDS.items():
+            if name in values:
+                setattr(self, name, values[name])
+            else:
+                setattr(self, name, parse(os.getenv(env_var, default)))
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+
+class APIConfig(_Section):
     """API Keys and credentials"""
-    groq_api_key: str = field(default_factory=lambda: os.getenv("GROQ_API_KEY", ""))
-    huggingface_token: str = field(default_factory=lambda: os.getenv("HUGGINGFACE_TOKEN", ""))
-    openai_api_key: str = field(default_factory=lambda: os.getenv("OPENAI_API_KEY", ""))
+    _FIELDS = {
+        "groq_api_key": ("GROQ_API_KEY", "", str),
+        "huggingface_token": ("HUGGINGFACE_TOKEN", "", str),
+        "openai_api_key": ("OPENAI_API_KEY", "", str),
+    }
+    __slots__ = tuple(_FIELDS)
     
     def validate(self) -> bool:
         """Check if required API keys are present"""
@@ -34,35 +68,39 @@ class APIConfig:
         return True
 
 
-@dataclass
-class EmailConfig:
+class EmailConfig(_Section):
     """Email configuration for sending summaries"""
-    host: str = field(default_factory=lambda: os.getenv("EMAIL_HOST", "smtp.gmail.com"))
-    port: int = field(default_factory=lambda: int(os.getenv("EMAIL_PORT", "587")))
-    use_tls: bool = field(default_factory=lambda: os.getenv("EMAIL_USE_TLS", "true").lower() == "true")
-    address: str = field(default_factory=lambda: os.getenv("EMAIL_ADDRESS", ""))
-    password: str = field(default_factory=lambda: os.getenv("EMAIL_PASSWORD", ""))
+    _FIELDS = {
+        "host": ("EMAIL_HOST", "smtp.gmail.com", str),
+        "port": ("EMAIL_PORT", "465", int),
+        "use_tls": ("EMAIL_USE_TLS", "true", _flag),
+        "address": ("EMAIL_ADDRESS", "", str),
+        "password": ("EMAIL_PASSWORD", "", str),
+    }
+    __slots__ = tuple(_FIELDS)
     
     def is_configured(self) -> bool:
         """Check if email is properly configured"""
         return bool(self.address and self.password)
 
 
-@dataclass
-class ModelConfig:
+class ModelConfig(_Section):
     """Model settings for STT, Diarization, and LLM"""
-    # STT Settings
-    stt_model: str = field(default_factory=lambda: os.getenv("STT_MODEL", "whisper"))
-    whisper_model_size: str = field(default_factory=lambda: os.getenv("WHISPER_MODEL_SIZE", "base"))
-    vosk_model_path: str = field(default_factory=lambda: os.getenv("VOSK_MODEL_PATH", "models/vosk-model-small-en-us-0.15"))
-    
-    # Diarization
-    diarization_model: str = field(default_factory=lambda: os.getenv("DIARIZATION_MODEL", "pyannote/speaker-diarization-3.1"))
-    
-    # LLM Settings
-    llm_model: str = field(default_factory=lambda: os.getenv("LLM_MODEL", "llama-3.1-70b-versatile"))
-    llm_temperature: float = field(default_factory=lambda: float(os.getenv("LLM_TEMPERATURE", "0.3")))
-    llm_max_tokens: int = field(default_factory=lambda: int(os.getenv("LLM_MAX_TOKENS", "2000")))
+    _FIELDS = {
+        # STT Settings
+        "stt_model": ("STT_MODEL", "whisper", str),
+        "whisper_model_size": ("WHISPER_MODEL_SIZE", "base", str),
+        "vosk_model_path": ("VOSK_MODEL_PATH", "models/vosk-model-small-en-us-0.15", str),
+        
+        # Diarization
+        "diarization_model": ("DIARIZATION_MODEL", "pyannote/speaker-diarization-3.1", str),
+        
+        # LLM Settings
+        "llm_model": ("LLM_MODEL", "llama-3.1-70b-versatile", str),
+        "llm_temperature": ("LLM_TEMPERATURE", "0.3", float),
+        "llm_max_tokens": ("LLM_MAX_TOKENS", "2000", int),
+    }
+    __slots__ = tuple(_FIELDS)
     
     @property
     def whisper_model_path(self) -> Path:
@@ -75,75 +113,92 @@ class ModelConfig:
         return PROJECT_ROOT / self.vosk_model_path
 
 
-@dataclass
-class AudioConfig:
+class AudioConfig(_Section):
     """Audio recording and processing settings"""
-    sample_rate: int = field(default_factory=lambda: int(os.getenv("SAMPLE_RATE", "16000")))
-    channels: int = field(default_factory=lambda: int(os.getenv("CHANNELS", "1")))
-    chunk_size: int = field(default_factory=lambda: int(os.getenv("CHUNK_SIZE", "1024")))
-    audio_format: str = field(default_factory=lambda: os.getenv("AUDIO_FORMAT", "int16"))
-    
-    # Voice Activity Detection
-    vad_threshold: float = field(default_factory=lambda: float(os.getenv("VAD_THRESHOLD", "0.5")))
-    silence_duration: float = field(default_factory=lambda: float(os.getenv("SILENCE_DURATION", "1.5")))
+    _FIELDS = {
+        "sample_rate": ("SAMPLE_RATE", "16000", int),
+        "channels": ("CHANNELS", "1", int),
+        "chunk_size": ("CHUNK_SIZE", "1024", int),
+        "audio_format": ("AUDIO_FORMAT", "int16", str),
+        
+        # Voice Activity Detection
+        "vad_threshold": ("VAD_THRESHOLD", "0.5", float),
+        "silence_duration": ("SILENCE_DURATION", "1.5", float),
+    }
+    __slots__ = tuple(_FIELDS)
 
 
-@dataclass
-class PathConfig:
+class PathConfig(_Section):
     """Directory paths for data storage"""
-    data_dir: Path = field(default_factory=lambda: PROJECT_ROOT / os.getenv("DATA_DIR", "data"))
-    models_dir: Path = field(default_factory=lambda: PROJECT_ROOT / os.getenv("MODELS_DIR", "models"))
-    outputs_dir: Path = field(default_factory=lambda: PROJECT_ROOT / os.getenv("OUTPUTS_DIR", "outputs"))
-    recordings_dir: Path = field(default_factory=lambda: PROJECT_ROOT / os.getenv("RECORDINGS_DIR", "outputs/recordings"))
-    transcripts_dir: Path = field(default_factory=lambda: PROJECT_ROOT / os.getenv("TRANSCRIPTS_DIR", "data/transcripts"))
-    summaries_dir: Path = field(default_factory=lambda: PROJECT_ROOT / os.getenv("SUMMARIES_DIR", "data/summaries"))
-    exports_dir: Path = field(default_factory=lambda: PROJECT_ROOT / os.getenv("EXPORTS_DIR", "outputs/exports"))
-    logs_dir: Path = field(default_factory=lambda: PROJECT_ROOT / os.getenv("LOGS_DIR", "outputs/logs"))
+    _FIELDS = {
+        "data_dir": ("DATA_DIR", "data", _project_path),
+        "models_dir": ("MODELS_DIR", "models", _project_path),
+        "outputs_dir": ("OUTPUTS_DIR", "outputs", _project_path),
+        "recordings_dir": ("RECORDINGS_DIR", "outputs/recordings", _project_path),
+        "transcripts_dir": ("TRANSCRIPTS_DIR", "data/transcripts", _project_path),
+        "summaries_dir": ("SUMMARIES_DIR", "data/summaries", _project_path),
+        "exports_dir": ("EXPORTS_DIR", "outputs/exports", _project_path),
+        "logs_dir": ("LOGS_DIR", "outputs/logs", _project_path),
+    }
+    __slots__ = tuple(_FIELDS) + ("_dirs_created",)
+    
+    def __init__(self, **values):
+        super().__init__(**values)
+        self._dirs_created = False
     
     def create_directories(self):
-        """Create all required directories if they don't exist"""
-        for path in [self.data_dir, self.models_dir, self.outputs_dir, 
-                     self.recordings_dir, self.transcripts_dir, self.summaries_dir,
-                     self.exports_dir, self.logs_dir]:
-            path.mkdir(parents=True, exist_ok=True)
+        """Create all required directories if they don't exist (once per instance)"""
+        if self._dirs_created:
+            return
+        for name in self._FIELDS:
+            getattr(self, name).mkdir(parents=True, exist_ok=True)
+        self._dirs_created = True
         print("✅ All directories created/verified")
 
 
-@dataclass
-class ProcessingConfig:
+class ProcessingConfig(_Section):
     """Processing and performance settings"""
-    enable_real_time_stt: bool = field(default_factory=lambda: os.getenv("ENABLE_REAL_TIME_STT", "true").lower() == "true")
-    enable_diarization: bool = field(default_factory=lambda: os.getenv("ENABLE_DIARIZATION", "true").lower() == "true")
-    enable_auto_summary: bool = field(default_factory=lambda: os.getenv("ENABLE_AUTO_SUMMARY", "true").lower() == "true")
-    
-    max_recording_duration: int = field(default_factory=lambda: int(os.getenv("MAX_RECORDING_DURATION", "7200")))
-    processing_threads: int = field(default_factory=lambda: int(os.getenv("PROCESSING_THREADS", "4")))
-    use_gpu: bool = field(default_factory=lambda: os.getenv("USE_GPU", "true").lower() == "true")
+    _FIELDS = {
+        "enable_real_time_stt": ("ENABLE_REAL_TIME_STT", "true", _flag),
+        "enable_diarization": ("ENABLE_DIARIZATION", "true", _flag),
+        "enable_auto_summary": ("ENABLE_AUTO_SUMMARY", "true", _flag),
+        
+        "max_recording_duration": ("MAX_RECORDING_DURATION", "7200", int),
+        "processing_threads": ("PROCESSING_THREADS", "4", int),
+        "use_gpu": ("USE_GPU", "true", _flag),
+    }
+    __slots__ = tuple(_FIELDS)
 
 
-@dataclass
-class DiarizationConfig:
+class DiarizationConfig(_Section):
     """Speaker diarization specific settings"""
-    min_speakers: int = field(default_factory=lambda: int(os.getenv("MIN_SPEAKERS", "1")))
-    max_speakers: int = field(default_factory=lambda: int(os.getenv("MAX_SPEAKERS", "10")))
-    min_segment_duration: float = field(default_factory=lambda: float(os.getenv("MIN_SEGMENT_DURATION", "1.0")))
+    _FIELDS = {
+        "min_speakers": ("MIN_SPEAKERS", "1", int),
+        "max_speakers": ("MAX_SPEAKERS", "10", int),
+        "min_segment_duration": ("MIN_SEGMENT_DURATION", "1.0", float),
+    }
+    __slots__ = tuple(_FIELDS)
 
 
-@dataclass
-class SummarizationConfig:
+class SummarizationConfig(_Section):
     """Summarization settings"""
-    summary_style: str = field(default_factory=lambda: os.getenv("SUMMARY_STYLE", "professional"))
-    include_timestamps: bool = field(default_factory=lambda: os.getenv("INCLUDE_TIMESTAMPS", "true").lower() == "true")
-    include_speaker_stats: bool = field(default_factory=lambda: os.getenv("INCLUDE_SPEAKER_STATS", "true").lower() == "true")
-    include_action_items: bool = field(default_factory=lambda: os.getenv("INCLUDE_ACTION_ITEMS", "true").lower() == "true")
+    _FIELDS = {
+        "summary_style": ("SUMMARY_STYLE", "professional", str),
+        "include_timestamps": ("INCLUDE_TIMESTAMPS", "true", _flag),
+        "include_speaker_stats": ("INCLUDE_SPEAKER_STATS", "true", _flag),
+        "include_action_items": ("INCLUDE_ACTION_ITEMS", "true", _flag),
+    }
+    __slots__ = tuple(_FIELDS)
 
 
-@dataclass
-class ExportConfig:
+class ExportConfig(_Section):
     """Export and file format settings"""
-    default_format: str = field(default_factory=lambda: os.getenv("DEFAULT_EXPORT_FORMAT", "pdf"))
-    pdf_page_size: str = field(default_factory=lambda: os.getenv("PDF_PAGE_SIZE", "A4"))
-    pdf_font_size: int = field(default_factory=lambda: int(os.getenv("PDF_FONT_SIZE", "11")))
+    _FIELDS = {
+        "default_format": ("DEFAULT_EXPORT_FORMAT", "pdf", str),
+        "pdf_page_size": ("PDF_PAGE_SIZE", "A4", str),
+        "pdf_font_size": ("PDF_FONT_SIZE", "11", int),
+    }
+    __slots__ = tuple(_FIELDS)
 
 
 class Config:
@@ -215,27 +270,22 @@ class Config:
         print("="*50 + "\n")
 
 
-# Singleton instance
-_config_instance: Optional[Config] = None
-
-
+@lru_cache(maxsize=1)
 def get_config() -> Config:
     """Get or create the global configuration instance"""
-    global _config_instance
-    if _config_instance is None:
-        _config_instance = Config()
-    return _config_instance
+    return Config()
 
 
 def reload_config() -> Config:
     """Force reload configuration from .env file"""
-    global _config_instance
     load_dotenv(override=True)
-    _config_instance = Config()
-    return _config_instance
+    get_config.cache_clear()
+    get_api_key.cache_clear()
+    return get_config()
 
 
 # Quick access functions
+@lru_cache(maxsize=None)
 def get_api_key(service: str) -> str:
     """Quick access to API keys"""
     config = get_config()
@@ -5,7 +5,7 @@ Downloads required models for STT and diarization
 
 import os
 import json
-import whisper
+from faster_whisper import download_model
 import subprocess
 import requests
 import zipfile
@@ -16,8 +16,10 @@ def download_whisper_model():
     """Download Whisper model for speech-to-text"""
     print("📥 Downloading Whisper model...")
     try:
-        # This will download and cache the model
-        model = whisper.load_model("base")
+        # Same location RealTimeTranscriber loads from (whisper_model_path/<size>)
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+        from utils.config import get_config
+        download_model("base", output_dir=str(get_config().model.whisper_model_path / "base"))
         print("✅ Whisper model downloaded successfully!")
         return True
     except Exception as e:
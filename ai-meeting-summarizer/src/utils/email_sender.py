@@ -3,18 +3,241 @@ Email Sender Module
 Sends meeting summaries via email with attachments
 """
 
-import smtplib
 import os
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
+import io
+import copy
+import logging
+import base64
+import gzip
+import mmap
+import shutil
+import string
+import sqlite3
+import threading
+import time
+import importlib.util
+from collections import OrderedDict
+from html import escape
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
-from datetime import datetime
-from dotenv import load_dotenv
+from typing import Optional, List, Dict, Tuple, TYPE_CHECKING
 
-load_dotenv()
+log = logging.getLogger(__name__)
+
+# smtplib, ssl, the email.mime stack and asyncio are imported where they are used,
+# so importing this module stays cheap for processes that never send mail
+if TYPE_CHECKING:
+    import smtplib
+    import ssl
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.base import MIMEBase
+
+# Credentials already in the environment make reading .env unnecessary
+if os.getenv("EMAIL_ADDRESS") is None:
+    from dotenv import load_dotenv
+    load_dotenv()
+
+# aiosmtplib is optional; it enables concurrent sends to many recipients
+AIOSMTPLIB_AVAILABLE = importlib.util.find_spec("aiosmtplib") is not None
+
+# A pooled connection idle for longer than this is reconnected rather than
+# reused (servers drop idle sessions; ~100 s matches common SMTP pools)
+SMTP_IDLE_TIMEOUT = 100.0
+
+# Implicit-TLS submission port (SMTPS); other ports use STARTTLS by default
+SMTPS_PORT = 465
+
+# Socket timeout for SMTP operations (seconds)
+SMTP_TIMEOUT = 30.0
+
+# Concurrent connections used by send_summary_async
+SMTP_MAX_CONNECTIONS = 8
+
+# Max envelope recipients per message in send_summary_bulk (common server limit)
+SMTP_MAX_RCPTS = 100
+
+# Durable outbound queue: location, rows sent per drain pass, retry backoff
+EMAIL_QUEUE_DB = Path("outputs/email_queue.db")
+EMAIL_QUEUE_BATCH_SIZE = 20
+EMAIL_QUEUE_POLL_SECONDS = 5.0
+EMAIL_RETRY_BASE_SECONDS = 30.0
+EMAIL_MAX_ATTEMPTS = 6
+
+# A claimed row not finished within its lease (worker crashed or was killed)
+# becomes due again; the lease also grows by the worst-case send time of
+# every row in the claimed batch
+EMAIL_CLAIM_LEASE_SECONDS = 300.0
+
+# Text attachments larger than this are gzipped before base64 encoding
+GZIP_ATTACHMENT_SUFFIXES = {'.txt', '.json', '.jsonl', '.srt', '.vtt', '.md', '.csv'}
+GZIP_MIN_BYTES = 16 * 1024
+
+# Attachments larger than this are base64-encoded straight from an mmap
+MMAP_ATTACHMENT_BYTES = 8 * 1024 * 1024
+
+# RFC 5321 line limit; text bodies with longer lines can't be sent as 8bit
+SMTP_MAX_LINE_BYTES = 998
+
+# Recently rendered (text, HTML) bodies kept per sender, keyed by summary content
+RENDER_CACHE_SIZE = 4
+
+# Attachment read size for streaming base64 (57 * 1149 bytes, just under 64 KiB)
+ATTACHMENT_READ_BYTES = 57 * 1149
+
+
+# Static stylesheet for the HTML summary email
+_EMAIL_CSS = """
+    body {
+        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+        line-height: 1.6;
+        color: #333;
+        max-width: 800px;
+        margin: 0 auto;
+        padding: 20px;
+    }
+    .header {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 30px;
+        border-radius: 10px;
+        margin-bottom: 30px;
+    }
+    .header h1 {
+        margin: 0;
+        font-size: 28px;
+    }
+    .header p {
+        margin: 10px 0 0 0;
+        opacity: 0.9;
+    }
+    .section {
+        background: #f8f9fa;
+        padding: 20px;
+        margin: 20px 0;
+        border-radius: 8px;
+        border-left: 4px solid #667eea;
+    }
+    .section h2 {
+        color: #667eea;
+        margin-top: 0;
+        font-size: 20px;
+    }
+    ul {
+        padding-left: 20px;
+    }
+    li {
+        margin: 8px 0;
+    }
+    .metadata {
+        background: #e9ecef;
+        padding: 15px;
+        border-radius: 5px;
+        margin: 20px 0;
+    }
+    .metadata p {
+        margin: 5px 0;
+        color: #666;
+    }
+    .footer {
+        text-align: center;
+        margin-top: 40px;
+        padding-top: 20px;
+        border-top: 2px solid #e9ecef;
+        color: #999;
+        font-size: 14px;
+    }
+    .action-item {
+        background: #fff3cd;
+        padding: 10px;
+        margin: 5px 0;
+        border-radius: 5px;
+        border-left: 3px solid #ffc107;
+    }
+"""
+
+# HTML email skeleton, parsed once at import; only the $fields change per send
+_HTML_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<style>""" + _EMAIL_CSS + """</style>
+</head>
+<body>
+    <div class="header">
+        <h1>🎙️ $meeting_name</h1>
+        <p>Meeting Summary Report</p>
+    </div>
+    
+    <div class="metadata">
+        <p><strong>📅 Date:</strong> $date</p>
+        <p><strong>⏱️ Duration:</strong> $duration minutes</p>
+        $participants_block
+    </div>
+    
+    <div class="section">
+        <h2>📋 Summary</h2>
+        <p>$summary</p>
+    </div>
+    $sections
+    <div class="footer">
+        <p>📧 This summary was generated automatically by AI Meeting Summarizer</p>
+        <p>Powered by Whisper, PyAnnote, and Groq LLM</p>
+    </div>
+</body>
+</html>
+""")
+
+_SECTION_TEMPLATE = string.Template("""
+    <div class="section">
+        <h2>$title</h2>
+        $body
+    </div>""")
+
+
+def _html_text(value) -> str:
+    """Escape a value for an HTML text node (LLM output may hold non-strings)"""
+    return escape(str(value), quote=False)
+
+
+def _html_section(title: str, body: str) -> str:
+    """Render one titled section of the HTML email"""
+    return _SECTION_TEMPLATE.substitute(title=title, body=body)
+
+
+def _summary_key(summary, meeting_name: str) -> Optional[tuple]:
+    """
+    Content key for a summary's rendered bodies. Built from the fields rather
+    than the object, so editing a summary never serves a stale render.
+    None if a field holds something unhashable (e.g. dicts from LLM JSON).
+    """
+    try:
+        key = (
+            meeting_name, summary.timestamp, summary.duration, summary.summary,
+            tuple(summary.participants or ()), tuple(summary.key_points or ()),
+            tuple(summary.action_items or ()), tuple(summary.decisions or ()),
+            tuple((summary.speaker_stats or {}).items())
+        )
+        hash(key)
+        return key
+    except TypeError:
+        return None
+
+
+def _text_part(text: str, subtype: str) -> "MIMEText":
+    """
+    UTF-8 text part sent as raw 8bit (no base64 of every emoji-laden body).
+    Falls back to the default base64 when a line exceeds the SMTP limit.
+    """
+    from email.mime.text import MIMEText
+    from email.charset import Charset
+    
+    if any(len(line.encode('utf-8')) > SMTP_MAX_LINE_BYTES for line in text.splitlines()):
+        return MIMEText(text, subtype, 'utf-8')
+    
+    charset = Charset('utf-8')
+    charset.body_encoding = None
+    return MIMEText(text, subtype, charset)
 
 
 class EmailSender:
@@ -27,22 +250,239 @@ class EmailSender:
         smtp_host: Optional[str] = None,
         smtp_port: Optional[int] = None,
         email_address: Optional[str] = None,
-        email_password: Optional[str] = None
+        email_password: Optional[str] = None,
+        use_starttls: Optional[bool] = None  # None: STARTTLS unless on port 465
     ):
         self.smtp_host = smtp_host or os.getenv("EMAIL_HOST", "smtp.gmail.com")
-        self.smtp_port = smtp_port or int(os.getenv("EMAIL_PORT", "587"))
+        self.smtp_port = smtp_port or int(os.getenv("EMAIL_PORT", str(SMTPS_PORT)))
         self.email_address = email_address or os.getenv("EMAIL_ADDRESS")
         self.email_password = email_password or os.getenv("EMAIL_PASSWORD")
         
+        # Implicit TLS (SMTPS) skips the STARTTLS exchange and its second EHLO
+        if use_starttls is None:
+            env_starttls = os.getenv("EMAIL_USE_STARTTLS")
+            if env_starttls is not None:
+                use_starttls = env_starttls.strip().lower() in ("1", "true", "yes", "on")
+            else:
+                use_starttls = self.smtp_port != SMTPS_PORT
+        self.use_starttls = use_starttls
+        
+        # Persistent SMTP session (TLS + login done once), reused across sends
+        self._conn: Optional["smtplib.SMTP"] = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+        
+        # One TLS context for every handshake: CA certs are loaded once and
+        # the context is shared by the smtplib and aiosmtplib paths
+        self._ssl_ctx: Optional["ssl.SSLContext"] = None
+        
+        # Durable outbound queue, created on first enqueue_summary() or at
+        # startup when an earlier run left messages undelivered
+        self._queue: Optional["EmailQueue"] = None
+        
+        # Background sender for send_summary_future(), created on first use.
+        # One worker: sends share the pooled session and would serialize anyway
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Rendered bodies of recent summaries; re-sending one skips rendering
+        self._rendered: "OrderedDict[tuple, Tuple[str, str]]" = OrderedDict()
+        self._render_lock = threading.Lock()
+        
         # Validate configuration
         if not self.email_address or not self.email_password:
-            print("⚠️ Email credentials not configured")
-            print("   Set EMAIL_ADDRESS and EMAIL_PASSWORD in your .env file")
+            log.warning("⚠️ Email credentials not configured "
+                        "(set EMAIL_ADDRESS and EMAIL_PASSWORD in your .env file)")
+        elif EMAIL_QUEUE_DB.exists():
+            self._resume_queue()
+    
+    def _resume_queue(self):
+        """Start delivering messages an earlier run queued but never sent"""
+        try:
+            queue = EmailQueue(self)
+            if queue.pending():
+                log.info("📬 Resuming %s queued email(s)", queue.pending())
+                queue.start()
+                self._queue = queue
+            else:
+                queue.stop()
+        except Exception as e:
+            log.warning("⚠️ Could not open email queue: %s", e)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
     
     def is_configured(self) -> bool:
         """Check if email is properly configured"""
         return bool(self.email_address and self.email_password)
     
+    def _tls_context(self) -> "ssl.SSLContext":
+        """Shared TLS context, created on first connect"""
+        if self._ssl_ctx is None:
+            import ssl
+            self._ssl_ctx = ssl.create_default_context()
+        return self._ssl_ctx
+    
+    def _connect(self) -> "smtplib.SMTP":
+        """Open a new authenticated SMTP session"""
+        import smtplib
+        if self.use_starttls:
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=SMTP_TIMEOUT)
+        else:
+            server = smtplib.SMTP_SSL(
+                self.smtp_host, self.smtp_port,
+                context=self._tls_context(), timeout=SMTP_TIMEOUT
+            )
+        try:
+            if self.use_starttls:
+                server.starttls(context=self._tls_context())
+            server.login(self.email_address, self.email_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _drop_conn(self):
+        """Discard the pooled session, closing it politely if possible"""
+        if self._conn is not None:
+            try:
+                self._conn.quit()
+            except Exception:
+                self._conn.close()
+            self._conn = None
+    
+    def _get_conn(self) -> "smtplib.SMTP":
+        """Return a live session, reconnecting if it is idle-expired or dead"""
+        import smtplib
+        if self._conn is not None and time.monotonic() - self._last_used > SMTP_IDLE_TIMEOUT:
+            self._drop_conn()
+        
+        if self._conn is not None:
+            try:
+                code, _ = self._conn.noop()
+                if code != 250:
+                    self._drop_conn()
+            except (smtplib.SMTPServerDisconnected, OSError):
+                self._conn = None
+        
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+    
+    def _send(self, msg, to_addrs: Optional[List[str]] = None) -> dict:
+        """
+        Send over the pooled session; retries once on a fresh connection
+        
+        msg is a Message, or already-serialized bytes (with to_addrs) so a
+        message sent in several envelopes is only flattened once.
+        Returns smtplib's dict of refused recipients.
+        """
+        import smtplib
+        with self._lock:
+            for attempt in range(2):
+                conn = self._get_conn()
+                try:
+                    # 8bit bodies go out as-is when the server speaks 8BITMIME;
+                    # otherwise the generator re-encodes them while flattening
+                    conn.ehlo_or_helo_if_needed()
+                    if conn.has_extn('8bitmime'):
+                        mail_options = ['BODY=8BITMIME']
+                    else:
+                        mail_options = []
+                        if not isinstance(msg, bytes):
+                            msg = copy.copy(msg)
+                            msg.policy = msg.policy.clone(cte_type='7bit')
+                    
+                    if isinstance(msg, bytes):
+                        refused = conn.sendmail(self.email_address, to_addrs, msg, mail_options)
+                    else:
+                        refused = conn.send_message(msg, to_addrs=to_addrs, mail_options=mail_options)
+                    self._last_used = time.monotonic()
+                    return refused
+                except smtplib.SMTPServerDisconnected as e:
+                    error = e
+                except smtplib.SMTPException:
+                    # The server answered (rejected recipients, data error...);
+                    # retrying could deliver twice
+                    raise
+                except OSError as e:
+                    error = e
+                # Dead socket: drop it and retry once on a fresh connection
+                self._conn = None
+                if attempt:
+                    raise error
+    
+    def close(self, wait: bool = True):
+        """
+        Stop background senders and close the pooled SMTP session
+        
+        With wait=False in-flight sends finish in the background; claimed
+        queue rows are leased, so a later run picks up anything left over.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        if self._queue is not None:
+            self._queue.stop(wait=wait)
+            self._queue = None
+        with self._lock:
+            self._drop_conn()
+    
+    def send_summary_future(
+        self,
+        to_email: str,
+        summary,  # MeetingSummary object
+        meeting_name: str,
+        attach_files: Optional[list] = None
+    ) -> Future:
+        """
+        Run send_summary on a background thread
+        
+        Returns immediately; the Future resolves to send_summary's bool.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='email')
+        return self._executor.submit(self.send_summary, to_email, summary, meeting_name, attach_files)
+    
+    def enqueue_summary(
+        self,
+        to_email: str,
+        summary,  # MeetingSummary object
+        meeting_name: str,
+        attach_files: Optional[list] = None
+    ) -> bool:
+        """
+        Queue a meeting summary for background delivery
+        
+        The message is rendered and serialized now and stored on disk, so it
+        survives transient SMTP errors and restarts (a new sender resumes
+        undelivered rows); a worker thread sends it with exponential backoff.
+        
+        Returns:
+            True if the message was queued
+        """
+        if not self.is_configured():
+            log.error("❌ Email not configured. Cannot send.")
+            return False
+        
+        try:
+            parts = self._message_parts(summary, meeting_name, attach_files)
+            msg = self._new_message(f"Meeting Summary: {meeting_name}", to_email, parts)
+            
+            if self._queue is None:
+                self._queue = EmailQueue(self)
+                self._queue.start()
+            self._queue.enqueue([to_email], msg.as_bytes(policy=msg.policy.clone(linesep='\r\n')))
+            
+            log.info("📬 Email to %s queued", to_email)
+            return True
+            
+        except Exception as e:
+            log.error("❌ Error queueing email: %s", e)
+            return False
+    
     def send_summary(
         self,
         to_email: str,
@@ -62,227 +502,327 @@ class EmailSender:
         Returns:
             True if sent successfully, False otherwise
         """
+        import smtplib
         if not self.is_configured():
-            print("❌ Email not configured. Cannot send.")
+            log.error("❌ Email not configured. Cannot send.")
             return False
         
         try:
             # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"Meeting Summary: {meeting_name}"
-            msg['From'] = self.email_address
-            msg['To'] = to_email
-            msg['Date'] = datetime.now().strftime("%a, %d %b %Y %H:%M:%S %z")
-            
-            # Create email body
-            html_body = self._create_html_email(summary, meeting_name)
-            text_body = summary.to_markdown()
-            
-            # Attach both plain text and HTML versions
-            part1 = MIMEText(text_body, 'plain')
-            part2 = MIMEText(html_body, 'html')
-            
-            msg.attach(part1)
-            msg.attach(part2)
-            
-            # Attach files if provided
-            if attach_files:
-                for file_path in attach_files:
-                    self._attach_file(msg, file_path)
+            parts = self._message_parts(summary, meeting_name, attach_files)
+            msg = self._new_message(f"Meeting Summary: {meeting_name}", to_email, parts)
             
             # Send email
-            print(f"📧 Sending email to {to_email}...")
+            log.info("📧 Sending email to %s...", to_email)
             
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.email_address, self.email_password)
-                server.send_message(msg)
+            self._send(msg)
             
-            print(f"✅ Email sent successfully to {to_email}")
+            log.info("✅ Email sent successfully to %s", to_email)
             return True
             
         except smtplib.SMTPAuthenticationError:
-            print("❌ Email authentication failed. Check your credentials.")
-            print("   For Gmail: Use an App Password, not your regular password")
-            print("   Generate at: https://myaccount.google.com/apppasswords")
+            log.error("❌ Email authentication failed. Check your credentials. "
+                      "For Gmail, use an App Password, not your regular password "
+                      "(generate at: https://myaccount.google.com/apppasswords)")
             return False
             
         except Exception as e:
-            print(f"❌ Error sending email: {e}")
+            log.error("❌ Error sending email: %s", e)
             return False
     
-    def _create_html_email(self, summary, meeting_name: str) -> str:
-        """Create beautiful HTML email body"""
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 30px;
-                    border-radius: 10px;
-                    margin-bottom: 30px;
-                }}
-                .header h1 {{
-                    margin: 0;
-                    font-size: 28px;
-                }}
-                .header p {{
-                    margin: 10px 0 0 0;
-                    opacity: 0.9;
-                }}
-                .section {{
-                    background: #f8f9fa;
-                    padding: 20px;
-                    margin: 20px 0;
-                    border-radius: 8px;
-                    border-left: 4px solid #667eea;
-                }}
-                .section h2 {{
-                    color: #667eea;
-                    margin-top: 0;
-                    font-size: 20px;
-                }}
-                ul {{
-                    padding-left: 20px;
-                }}
-                li {{
-                    margin: 8px 0;
-                }}
-                .metadata {{
-                    background: #e9ecef;
-                    padding: 15px;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                }}
-                .metadata p {{
-                    margin: 5px 0;
-                    color: #666;
-                }}
-                .footer {{
-                    text-align: center;
-                    margin-top: 40px;
-                    padding-top: 20px;
-                    border-top: 2px solid #e9ecef;
-                    color: #999;
-                    font-size: 14px;
-                }}
-                .action-item {{
-                    background: #fff3cd;
-                    padding: 10px;
-                    margin: 5px 0;
-                    border-radius: 5px;
-                    border-left: 3px solid #ffc107;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>🎙️ {meeting_name}</h1>
-                <p>Meeting Summary Report</p>
-            </div>
-            
-            <div class="metadata">
-                <p><strong>📅 Date:</strong> {summary.timestamp.strftime('%A, %B %d, %Y at %I:%M %p')}</p>
-                <p><strong>⏱️ Duration:</strong> {summary.duration:.1f} minutes</p>
-                {f'<p><strong>👥 Participants:</strong> {", ".join(summary.participants)}</p>' if summary.participants else ''}
-            </div>
+    def send_summary_many(
+        self,
+        to_emails: List[str],
+        summary,  # MeetingSummary object
+        meeting_name: str,
+        attach_files: Optional[list] = None
+    ) -> Dict[str, bool]:
+        """
+        Send a personal copy of a meeting summary to each recipient
+        
+        Bodies and attachments are rendered/encoded once; each recipient gets
+        a fresh message wrapping the same parts, sent over the pooled session.
+        
+        Returns:
+            Mapping of recipient -> True if sent successfully
+        """
+        if not self.is_configured():
+            log.error("❌ Email not configured. Cannot send.")
+            return {to_email: False for to_email in to_emails}
+        
+        try:
+            parts = self._message_parts(summary, meeting_name, attach_files)
+        except Exception as e:
+            log.error("❌ Error building email: %s", e)
+            return {to_email: False for to_email in to_emails}
+        
+        subject = f"Meeting Summary: {meeting_name}"
+        results = {}
+        for to_email in to_emails:
+            try:
+                self._send(self._new_message(subject, to_email, parts))
+                log.info("✅ Email sent successfully to %s", to_email)
+                results[to_email] = True
+            except Exception as e:
+                log.error("❌ Error sending email to %s: %s", to_email, e)
+                results[to_email] = False
+        return results
+    
+    def send_summary_bulk(
+        self,
+        to_emails: List[str],
+        summary,  # MeetingSummary object
+        meeting_name: str,
+        attach_files: Optional[list] = None
+    ) -> Dict[str, bool]:
+        """
+        Send one copy of a meeting summary to a distribution list
+        
+        The message is rendered and serialized once, then delivered with one
+        MAIL FROM and many RCPT TO per SMTP_MAX_RCPTS recipients. Addresses
+        only appear in the envelope (To: undisclosed-recipients).
+        
+        Returns:
+            Mapping of recipient -> True if the server accepted it
+        """
+        import smtplib
+        if not self.is_configured():
+            log.error("❌ Email not configured. Cannot send.")
+            return {to_email: False for to_email in to_emails}
+        
+        results = {}
+        try:
+            parts = self._message_parts(summary, meeting_name, attach_files)
+            msg = self._new_message(f"Meeting Summary: {meeting_name}", "undisclosed-recipients:;", parts)
+            data = msg.as_bytes(policy=msg.policy.clone(linesep='\r\n'))
+        except Exception as e:
+            log.error("❌ Error building email: %s", e)
+            return {to_email: False for to_email in to_emails}
+        
+        log.info("📧 Sending email to %s recipients...", len(to_emails))
+        for start in range(0, len(to_emails), SMTP_MAX_RCPTS):
+            batch = to_emails[start:start + SMTP_MAX_RCPTS]
+            try:
+                refused = self._send(data, to_addrs=batch)
+            except smtplib.SMTPRecipientsRefused as e:
+                refused = e.recipients
+            except Exception as e:
+                log.error("❌ Error sending email: %s", e)
+                refused = dict.fromkeys(batch)
             
-            <div class="section">
-                <h2>📋 Summary</h2>
-                <p>{summary.summary}</p>
-            </div>
+            for to_email in batch:
+                results[to_email] = to_email not in refused
+        
+        sent = sum(results.values())
+        log.info("✅ Email sent to %s/%s recipients", sent, len(to_emails))
+        return results
+    
+    async def send_summary_async(
+        self,
+        to_emails: List[str],
+        summary,  # MeetingSummary object
+        meeting_name: str,
+        attach_files: Optional[list] = None
+    ) -> Dict[str, bool]:
         """
+        Send a meeting summary to several recipients concurrently
+        
+        The body and attachments are built once; each recipient gets its own
+        message over up to SMTP_MAX_CONNECTIONS parallel connections.
+        Falls back to sequential send_summary calls without aiosmtplib.
         
+        Returns:
+            Mapping of recipient -> True if sent successfully
+        """
+        import asyncio
+        
+        if not self.is_configured():
+            log.error("❌ Email not configured. Cannot send.")
+            return {to_email: False for to_email in to_emails}
+        
+        if not AIOSMTPLIB_AVAILABLE:
+            return {
+                to_email: self.send_summary(to_email, summary, meeting_name, attach_files)
+                for to_email in to_emails
+            }
+        import aiosmtplib
+        
+        subject = f"Meeting Summary: {meeting_name}"
+        parts = self._message_parts(summary, meeting_name, attach_files)
+        semaphore = asyncio.Semaphore(SMTP_MAX_CONNECTIONS)
+        
+        async def send_one(to_email: str) -> bool:
+            async with semaphore:
+                try:
+                    await aiosmtplib.send(
+                        self._new_message(subject, to_email, parts),
+                        hostname=self.smtp_host,
+                        port=self.smtp_port,
+                        username=self.email_address,
+                        password=self.email_password,
+                        use_tls=not self.use_starttls,
+                        start_tls=self.use_starttls,
+                        tls_context=self._tls_context(),
+                        timeout=SMTP_TIMEOUT
+                    )
+                    log.info("✅ Email sent successfully to %s", to_email)
+                    return True
+                except Exception as e:
+                    log.error("❌ Error sending email to %s: %s", to_email, e)
+                    return False
+        
+        log.info("📧 Sending email to %s recipients...", len(to_emails))
+        results = await asyncio.gather(*(send_one(to_email) for to_email in to_emails))
+        return dict(zip(to_emails, results))
+    
+    def _build_message_parts(self, summary, meeting_name: str) -> Tuple[str, str]:
+        """Render the (plain text, HTML) email bodies for a summary, reusing recent renders"""
+        key = _summary_key(summary, meeting_name)
+        if key is not None:
+            with self._render_lock:
+                bodies = self._rendered.get(key)
+                if bodies is not None:
+                    self._rendered.move_to_end(key)
+                    return bodies
+        
+        bodies = summary.to_markdown(), self._create_html_email(summary, meeting_name)
+        
+        if key is not None:
+            with self._render_lock:
+                self._rendered[key] = bodies
+                while len(self._rendered) > RENDER_CACHE_SIZE:
+                    self._rendered.popitem(last=False)
+        return bodies
+    
+    def _message_parts(self, summary, meeting_name: str, attach_files: Optional[list] = None) -> list:
+        """Body (plain text + HTML) and attachment parts, shareable between messages"""
+        text_body, html_body = self._build_message_parts(summary, meeting_name)
+        
+        # Both plain text and HTML versions
+        parts = [_text_part(text_body, 'plain'), _text_part(html_body, 'html')]
+        
+        # Attach files if provided
+        for file_path in attach_files or []:
+            part = self._attachment_part(file_path)
+            if part is not None:
+                parts.append(part)
+        return parts
+    
+    def _new_message(self, subject: str, to_email: str, parts: list) -> "MIMEMultipart":
+        """Wrap prebuilt parts in a message addressed to one recipient"""
+        from email.mime.multipart import MIMEMultipart
+        from email.utils import formatdate
+        
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = self.email_address
+        msg['To'] = to_email
+        msg['Date'] = formatdate(localtime=True)
+        for part in parts:
+            msg.attach(part)
+        return msg
+    
+    def _create_html_email(self, summary, meeting_name: str) -> str:
+        """Create beautiful HTML email body (all summary text is HTML-escaped)"""
+        participants_block = (
+            f'<p><strong>👥 Participants:</strong> {", ".join(map(_html_text, summary.participants))}</p>'
+            if summary.participants else ''
+        )
+        
+        sections = []
         if summary.key_points:
-            html += """
-            <div class="section">
-                <h2>🔑 Key Points</h2>
-                <ul>
-            """
-            for point in summary.key_points:
-                html += f"<li>{point}</li>"
-            html += "</ul></div>"
+            sections.append(_html_section(
+                "🔑 Key Points",
+                "<ul>" + "".join(f"<li>{_html_text(point)}</li>" for point in summary.key_points) + "</ul>"
+            ))
         
         if summary.action_items:
-            html += """
-            <div class="section">
-                <h2>✅ Action Items</h2>
-            """
-            for item in summary.action_items:
-                html += f'<div class="action-item">☐ {item}</div>'
-            html += "</div>"
+            sections.append(_html_section(
+                "✅ Action Items",
+                "".join(f'<div class="action-item">☐ {_html_text(item)}</div>' for item in summary.action_items)
+            ))
         
         if summary.decisions:
-            html += """
-            <div class="section">
-                <h2>⚖️ Decisions Made</h2>
-                <ul>
-            """
-            for decision in summary.decisions:
-                html += f"<li>{decision}</li>"
-            html += "</ul></div>"
+            sections.append(_html_section(
+                "⚖️ Decisions Made",
+                "<ul>" + "".join(f"<li>{_html_text(decision)}</li>" for decision in summary.decisions) + "</ul>"
+            ))
         
         if summary.speaker_stats:
-            html += """
-            <div class="section">
-                <h2>💬 Speaking Time</h2>
-                <ul>
-            """
-            for speaker, percentage in summary.speaker_stats.items():
-                html += f"<li><strong>{speaker}:</strong> {percentage:.1f}%</li>"
-            html += "</ul></div>"
-        
-        html += """
-            <div class="footer">
-                <p>📧 This summary was generated automatically by AI Meeting Summarizer</p>
-                <p>Powered by Whisper, PyAnnote, and Groq LLM</p>
-            </div>
-        </body>
-        </html>
-        """
+            sections.append(_html_section(
+                "💬 Speaking Time",
+                "<ul>" + "".join(
+                    f"<li><strong>{_html_text(speaker)}:</strong> {percentage:.1f}%</li>"
+                    for speaker, percentage in summary.speaker_stats.items()
+                ) + "</ul>"
+            ))
         
-        return html
+        return _HTML_TEMPLATE.substitute(
+            meeting_name=_html_text(meeting_name),
+            date=summary.timestamp.strftime('%A, %B %d, %Y at %I:%M %p'),
+            duration=f"{summary.duration:.1f}",
+            participants_block=participants_block,
+            summary=_html_text(summary.summary),
+            sections="".join(sections)
+        )
     
-    def _attach_file(self, msg: MIMEMultipart, file_path: Path):
-        """Attach a file to the email"""
+    def _attachment_part(self, file_path: Path) -> Optional["MIMEBase"]:
+        """Build an attachment part for a file (None if it can't be read)"""
+        from email.mime.base import MIMEBase
         try:
             file_path = Path(file_path)
             if not file_path.exists():
-                print(f"⚠️ Attachment not found: {file_path}")
-                return
+                log.warning("⚠️ Attachment not found: %s", file_path)
+                return None
+            
+            filename = file_path.name
+            content_type = ('application', 'octet-stream')
             
-            # Read file
             with open(file_path, 'rb') as f:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(f.read())
+                source = f
+                
+                # Text compresses several-fold, which outweighs base64's 33% growth
+                if (file_path.suffix.lower() in GZIP_ATTACHMENT_SUFFIXES
+                        and file_path.stat().st_size > GZIP_MIN_BYTES):
+                    source = io.BytesIO()
+                    with gzip.GzipFile(fileobj=source, mode='wb', compresslevel=6, mtime=0) as gz:
+                        shutil.copyfileobj(f, gz, ATTACHMENT_READ_BYTES)
+                    source.seek(0)
+                    filename += '.gz'
+                    content_type = ('application', 'gzip')
+                
+                # Base64-encode block by block; blocks are a multiple of
+                # 57 bytes so each one encodes to whole 76-char lines
+                encoded = io.StringIO()
+                if source is f and file_path.stat().st_size > MMAP_ATTACHMENT_BYTES:
+                    # Large recordings: encode slices of the mapped file so no
+                    # per-block bytes copies are made on the Python heap
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        with memoryview(mm) as view:
+                            for start in range(0, len(view), ATTACHMENT_READ_BYTES):
+                                block = view[start:start + ATTACHMENT_READ_BYTES]
+                                encoded.write(base64.encodebytes(block).decode('ascii'))
+                                block.release()
+                else:
+                    while block := source.read(ATTACHMENT_READ_BYTES):
+                        encoded.write(base64.encodebytes(block).decode('ascii'))
             
-            # Encode file
-            encoders.encode_base64(part)
+            part = MIMEBase(*content_type)
+            part.set_payload(encoded.getvalue())
+            part['Content-Transfer-Encoding'] = 'base64'
             
             # Add header
             part.add_header(
                 'Content-Disposition',
-                f'attachment; filename= {file_path.name}'
+                f'attachment; filename= {filename}'
             )
             
-            # Attach to message
-            msg.attach(part)
-            print(f"📎 Attached: {file_path.name}")
+            log.info("📎 Attached: %s", filename)
+            return part
             
         except Exception as e:
-            print(f"⚠️ Could not attach {file_path}: {e}")
+            log.warning("⚠️ Could not attach %s: %s", file_path, e)
+            return None
     
     def send_test_email(self, to_email: str) -> bool:
         """Send a test email to verify configuration"""
@@ -290,10 +830,14 @@ class EmailSender:
             return False
         
         try:
+            from email.mime.multipart import MIMEMultipart
+            from email.utils import formatdate
+            
             msg = MIMEMultipart()
             msg['Subject'] = "Test Email - AI Meeting Summarizer"
             msg['From'] = self.email_address
             msg['To'] = to_email
+            msg['Date'] = formatdate(localtime=True)
             
             body = """
             <html>
@@ -309,21 +853,188 @@ class EmailSender:
             </html>
             """
             
-            msg.attach(MIMEText(body, 'html'))
+            msg.attach(_text_part(body, 'html'))
             
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.email_address, self.email_password)
-                server.send_message(msg)
+            self._send(msg)
             
-            print(f"✅ Test email sent to {to_email}")
+            log.info("✅ Test email sent to %s", to_email)
             return True
             
         except Exception as e:
-            print(f"❌ Test email failed: {e}")
+            log.error("❌ Test email failed: %s", e)
             return False
 
 
+class EmailQueue:
+    """
+    Disk-backed (SQLite) outbound mail queue drained by a background thread
+    
+    Rows hold the serialized message, so retries never re-render it. Sent
+    rows are kept as an archive; rows that keep failing are marked 'failed'.
+    """
+    
+    def __init__(
+        self,
+        sender: EmailSender,
+        db_path: Path = EMAIL_QUEUE_DB,
+        batch_size: int = EMAIL_QUEUE_BATCH_SIZE
+    ):
+        self.sender = sender
+        self.batch_size = batch_size
+        
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                to_email TEXT NOT NULL,
+                msg_blob BLOB NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                last_error TEXT
+            )
+        """)
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)"
+        )
+        self._db_lock = threading.Lock()
+        
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._close_on_exit = False
+        self._thread = None
+    
+    def start(self):
+        """Start the background delivery thread"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+    
+    def stop(self, wait: bool = True):
+        """
+        Stop the delivery thread; pending rows stay queued on disk
+        
+        With wait=False the thread finishes its current batch and closes the
+        database itself.
+        """
+        if self._thread is not None:
+            if not wait:
+                self._close_on_exit = True
+            self._stopping.set()
+            self._wake.set()
+            if not wait:
+                self._thread = None
+                return
+            self._thread.join()
+            self._thread = None
+        with self._db_lock:
+            self._db.close()
+    
+    def enqueue(self, to_addrs: List[str], msg_bytes: bytes) -> int:
+        """Store a serialized message for delivery; returns its row id"""
+        with self._db_lock:
+            cursor = self._db.execute(
+                "INSERT INTO outbox (to_email, msg_blob, next_attempt_at) VALUES (?, ?, ?)",
+                (",".join(to_addrs), msg_bytes, time.time())
+            )
+        self._wake.set()
+        return cursor.lastrowid
+    
+    def pending(self) -> int:
+        """Number of messages still waiting to be sent (including in-flight ones)"""
+        with self._db_lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status IN ('pending', 'sending')"
+            ).fetchone()[0]
+    
+    def _claim(self) -> list:
+        """
+        Atomically take up to batch_size due rows, marking them 'sending'
+        
+        The write transaction makes concurrent queues on the same database
+        (other threads or processes) claim disjoint rows. Claims carry a
+        lease, so rows held by a worker that died become due again.
+        """
+        now = time.time()
+        with self._db_lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._db.execute(
+                    "SELECT id, to_email, msg_blob, attempts FROM outbox "
+                    "WHERE status IN ('pending', 'sending') AND next_attempt_at <= ? "
+                    "ORDER BY next_attempt_at LIMIT ?",
+                    (now, self.batch_size)
+                ).fetchall()
+                # Each send may time out twice (retry on a fresh connection)
+                lease_until = now + EMAIL_CLAIM_LEASE_SECONDS + len(rows) * 2 * SMTP_TIMEOUT
+                self._db.executemany(
+                    "UPDATE outbox SET status = 'sending', next_attempt_at = ? WHERE id = ?",
+                    [(lease_until, row[0]) for row in rows]
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return rows
+    
+    def process_batch(self) -> int:
+        """Try to send up to batch_size due messages; returns how many were tried"""
+        import smtplib
+        rows = self._claim()
+        
+        for row_id, to_email, msg_blob, attempts in rows:
+            try:
+                self.sender._send(bytes(msg_blob), to_addrs=to_email.split(","))
+            except smtplib.SMTPRecipientsRefused as e:
+                # Permanent: every recipient was rejected
+                self._mark(row_id, 'failed', attempts + 1, error=str(e))
+                log.error("❌ Queued email to %s rejected: %s", to_email, e)
+            except Exception as e:
+                attempts += 1
+                if attempts >= EMAIL_MAX_ATTEMPTS:
+                    self._mark(row_id, 'failed', attempts, error=str(e))
+                    log.error("❌ Giving up on queued email to %s: %s", to_email, e)
+                else:
+                    retry_at = time.time() + EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+                    self._mark(row_id, 'pending', attempts, retry_at, str(e))
+                    log.warning("⚠️ Email to %s failed (attempt %s), will retry: %s", to_email, attempts, e)
+            else:
+                self._mark(row_id, 'sent', attempts + 1)
+                log.info("✅ Email sent successfully to %s", to_email)
+        
+        return len(rows)
+    
+    def _mark(self, row_id: int, status: str, attempts: int,
+              next_attempt_at: Optional[float] = None, error: Optional[str] = None):
+        """Record the outcome of a delivery attempt"""
+        with self._db_lock:
+            self._db.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, "
+                "next_attempt_at = COALESCE(?, next_attempt_at), last_error = ? WHERE id = ?",
+                (status, attempts, next_attempt_at, error, row_id)
+            )
+    
+    def _worker(self):
+        """Drain due messages until stopped, sleeping when nothing is due"""
+        while not self._stopping.is_set():
+            try:
+                if self.process_batch():
+                    continue
+            except Exception as e:
+                log.warning("⚠️ Email queue error: %s", e)
+            self._wake.wait(EMAIL_QUEUE_POLL_SECONDS)
+            self._wake.clear()
+        
+        if self._close_on_exit:
+            with self._db_lock:
+                self._db.close()
+
+
 def test_email():
     """Test email functionality"""
     print("🎯 Testing Email Sender")
@@ -364,4 +1075,5 @@ def test_email():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_email()
\ No newline at end of file